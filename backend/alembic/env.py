@@ -18,6 +18,10 @@ from app.models import (
     donation_book,
     user_rating,
     book_review,
+    resource_version,
+    counter,
+    book_hold,
+    circulation,
 )  # noqa: F401
 from app.models.user import Base  # Import Base from a model file
 
@@ -0,0 +1,41 @@
+"""Add borrow ledger date indexes
+
+Revision ID: 0a6e4c8d2f51
+Revises: f93c2d5e8b10
+Create Date: 2026-10-18 14:21:37.118402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0a6e4c8d2f51'
+down_revision: Union[str, None] = 'f93c2d5e8b10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('ix_borrow_records_borrow_date', ['borrow_date', 'borrow_id']),
+    ('ix_borrow_records_return_date', ['return_date', 'borrow_id']),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            op.create_index(
+                name, 'borrow_records', columns, unique=False,
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(INDEXES):
+            op.drop_index(
+                name, table_name='borrow_records', postgresql_concurrently=True, if_exists=True,
+            )
@@ -0,0 +1,36 @@
+"""Add unique index for one active borrow per user and book
+
+Revision ID: 1b7f3e9a5c02
+Revises: 0a6e4c8d2f51
+Create Date: 2026-10-18 14:58:44.930126
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1b7f3e9a5c02'
+down_revision: Union[str, None] = '0a6e4c8d2f51'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Fails if duplicate active borrows already exist; close the extras first.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'uq_borrow_records_active_user_book', 'borrow_records', ['user_id', 'book_id'],
+            unique=True, postgresql_concurrently=True, if_not_exists=True,
+            postgresql_where=sa.text("borrow_status IN ('pending', 'accepted', 'overdue')"),
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'uq_borrow_records_active_user_book', table_name='borrow_records',
+            postgresql_concurrently=True, if_exists=True,
+        )
@@ -0,0 +1,35 @@
+"""Add open loans by due date index
+
+Revision ID: 2c8d4f0b6e13
+Revises: 1b7f3e9a5c02
+Create Date: 2026-10-18 15:26:09.771853
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2c8d4f0b6e13'
+down_revision: Union[str, None] = '1b7f3e9a5c02'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_borrow_records_open_return_date', 'borrow_records', ['return_date'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True,
+            postgresql_where=sa.text("borrow_status IN ('pending', 'accepted')"),
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_borrow_records_open_return_date', table_name='borrow_records',
+            postgresql_concurrently=True, if_exists=True,
+        )
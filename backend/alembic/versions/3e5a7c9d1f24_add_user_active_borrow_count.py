@@ -0,0 +1,38 @@
+"""Add users.active_borrow_count
+
+Revision ID: 3e5a7c9d1f24
+Revises: 2c8d4f0b6e13
+Create Date: 2026-10-18 16:02:41.118503
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e5a7c9d1f24'
+down_revision: Union[str, None] = '2c8d4f0b6e13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'users',
+        sa.Column('active_borrow_count', sa.Integer(), server_default='0', nullable=False),
+    )
+    op.execute("""
+        UPDATE users u SET active_borrow_count = a.n
+        FROM (
+            SELECT user_id, count(*) AS n FROM borrow_records
+            WHERE borrow_status IN ('pending', 'accepted', 'overdue')
+            GROUP BY user_id
+        ) a
+        WHERE u.user_id = a.user_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'active_borrow_count')
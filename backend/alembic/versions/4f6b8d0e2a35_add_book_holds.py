@@ -0,0 +1,53 @@
+"""Add book_holds queue
+
+Revision ID: 4f6b8d0e2a35
+Revises: 3e5a7c9d1f24
+Create Date: 2026-10-18 16:48:12.530274
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f6b8d0e2a35'
+down_revision: Union[str, None] = '3e5a7c9d1f24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'book_holds',
+        sa.Column('hold_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('user_id', sa.String(length=50), nullable=False),
+        sa.Column('book_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), server_default='waiting', nullable=False),
+        sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=False),
+        sa.Column('ready_at', sa.TIMESTAMP(), nullable=True),
+        sa.Column('expires_at', sa.TIMESTAMP(), nullable=False),
+        sa.ForeignKeyConstraint(['book_id'], ['books.book_id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('hold_id'),
+    )
+    op.create_index(
+        'ix_book_holds_waiting_book_id', 'book_holds', ['book_id', 'hold_id'],
+        postgresql_where=sa.text("status = 'waiting'"),
+    )
+    op.create_index(
+        'ix_book_holds_open_expires_at', 'book_holds', ['expires_at'],
+        postgresql_where=sa.text("status IN ('waiting', 'ready')"),
+    )
+    op.create_index(
+        'uq_book_holds_open_user_book', 'book_holds', ['user_id', 'book_id'], unique=True,
+        postgresql_where=sa.text("status IN ('waiting', 'ready')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_book_holds_open_user_book', table_name='book_holds')
+    op.drop_index('ix_book_holds_open_expires_at', table_name='book_holds')
+    op.drop_index('ix_book_holds_waiting_book_id', table_name='book_holds')
+    op.drop_table('book_holds')
@@ -0,0 +1,74 @@
+"""Add partitioned borrow_records_archive
+
+Revision ID: 5a7c9e1b3d46
+Revises: 4f6b8d0e2a35
+Create Date: 2026-10-18 17:35:52.046118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a7c9e1b3d46'
+down_revision: Union[str, None] = '4f6b8d0e2a35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = "borrow_id, user_id, book_id, borrow_date, return_date, returned_at, borrow_status"
+
+
+def upgrade() -> None:
+    # Yearly partitions are created on demand by BorrowArchiveCRUD.
+    op.create_table(
+        'borrow_records_archive',
+        sa.Column('borrow_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.String(length=50), nullable=True),
+        sa.Column('book_id', sa.Integer(), nullable=True),
+        sa.Column('borrow_date', sa.Date(), nullable=False),
+        sa.Column('return_date', sa.Date(), nullable=True),
+        sa.Column('returned_at', sa.Date(), nullable=True),
+        sa.Column('borrow_status', sa.String(length=50), nullable=True),
+        sa.Column('archived_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['book_id'], ['books.book_id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('borrow_id', 'borrow_date'),
+        postgresql_partition_by='RANGE (borrow_date)',
+    )
+    op.create_index('ix_borrow_records_archive_user_status', 'borrow_records_archive', ['user_id', 'borrow_status'])
+    op.create_index('ix_borrow_records_archive_book_id', 'borrow_records_archive', ['book_id'])
+    op.create_index('ix_borrow_records_archive_borrow_date', 'borrow_records_archive', ['borrow_date', 'borrow_id'])
+    op.create_index('ix_borrow_records_archive_return_date', 'borrow_records_archive', ['return_date', 'borrow_id'])
+
+    # Archived loans stay in the borrow_status counters (see f93c2d5e8b10).
+    for event, transition in (('INSERT', 'NEW TABLE AS new_rows'), ('DELETE', 'OLD TABLE AS old_rows')):
+        op.execute(f"""
+            CREATE TRIGGER borrow_records_archive_counters_{event.lower()}
+            AFTER {event} ON borrow_records_archive
+            REFERENCING {transition}
+            FOR EACH STATEMENT EXECUTE FUNCTION count_borrow_statuses()
+        """)
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_borrow_records_closed_on', 'borrow_records',
+            [sa.text('coalesce(returned_at, return_date, borrow_date)')],
+            unique=False, postgresql_concurrently=True, if_not_exists=True,
+            postgresql_where=sa.text("borrow_status IN ('returned', 'rejected', 'pdf-viewed')"),
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_borrow_records_closed_on', table_name='borrow_records',
+            postgresql_concurrently=True, if_exists=True,
+        )
+    # Bring archived loans back; the counter triggers on both tables cancel out.
+    op.execute(f"INSERT INTO borrow_records ({COLUMNS}) SELECT {COLUMNS} FROM borrow_records_archive")
+    op.execute("DELETE FROM borrow_records_archive")
+    for event in ('insert', 'delete'):
+        op.execute(f"DROP TRIGGER IF EXISTS borrow_records_archive_counters_{event} ON borrow_records_archive")
+    op.drop_table('borrow_records_archive')  # drops the yearly partitions too
@@ -0,0 +1,121 @@
+"""Add circulation event queue and daily rollups
+
+Revision ID: 6b8d0f2a4c57
+Revises: 5a7c9e1b3d46
+Create Date: 2026-10-18 18:21:37.904412
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6b8d0f2a4c57'
+down_revision: Union[str, None] = '5a7c9e1b3d46'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Statement-level, like the counter triggers: one INSERT per statement.
+# New loans count as borrows (or PDF views); status changes count as
+# returns, rejections or overdues.
+LOG_CIRCULATION_EVENTS = """
+    CREATE OR REPLACE FUNCTION log_circulation_events() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            INSERT INTO circulation_events (book_id, event)
+            SELECT book_id,
+                   CASE WHEN borrow_status = 'pdf-viewed' THEN 'pdf_views' ELSE 'borrows' END
+            FROM new_rows WHERE book_id IS NOT NULL;
+        ELSE
+            INSERT INTO circulation_events (book_id, event)
+            SELECT n.book_id,
+                   CASE n.borrow_status
+                       WHEN 'returned' THEN 'returns'
+                       WHEN 'rejected' THEN 'rejections'
+                       ELSE 'overdues'
+                   END
+            FROM new_rows n JOIN old_rows o USING (borrow_id)
+            WHERE n.book_id IS NOT NULL
+              AND n.borrow_status IS DISTINCT FROM o.borrow_status
+              AND n.borrow_status IN ('returned', 'rejected', 'overdue');
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+# History known from the loans themselves: borrows and PDF views by
+# borrow_date, returns by returned_at. Rejection and overdue dates were
+# never recorded, so those start counting from this migration.
+BACKFILL = """
+    INSERT INTO circulation_daily (day, book_id, category, borrows, returns, pdf_views)
+    SELECT e.day, e.book_id, b.book_category,
+           count(*) FILTER (WHERE e.event = 'borrows'),
+           count(*) FILTER (WHERE e.event = 'returns'),
+           count(*) FILTER (WHERE e.event = 'pdf_views')
+    FROM (
+        SELECT borrow_date AS day, book_id,
+               CASE WHEN borrow_status = 'pdf-viewed' THEN 'pdf_views' ELSE 'borrows' END AS event
+        FROM loans WHERE borrow_date IS NOT NULL
+        UNION ALL
+        SELECT returned_at, book_id, 'returns'
+        FROM loans WHERE borrow_status = 'returned' AND returned_at IS NOT NULL
+    ) e
+    LEFT JOIN books b ON b.book_id = e.book_id
+    WHERE e.book_id IS NOT NULL
+    GROUP BY e.day, e.book_id, b.book_category
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        'circulation_events',
+        sa.Column('event_id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('occurred_on', sa.Date(), server_default=sa.text('CURRENT_DATE'), nullable=False),
+        sa.Column('book_id', sa.Integer(), nullable=False),
+        sa.Column('event', sa.String(length=20), nullable=False),
+        sa.PrimaryKeyConstraint('event_id'),
+    )
+    op.create_table(
+        'circulation_daily',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('book_id', sa.Integer(), nullable=False),
+        sa.Column('category', sa.String(), nullable=True),
+        sa.Column('borrows', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('returns', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('rejections', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('overdues', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('pdf_views', sa.Integer(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint('day', 'book_id'),
+    )
+
+    op.execute(LOG_CIRCULATION_EVENTS)
+    for event, transition in (
+        ('INSERT', 'NEW TABLE AS new_rows'),
+        ('UPDATE', 'OLD TABLE AS old_rows NEW TABLE AS new_rows'),
+    ):
+        op.execute(f"""
+            CREATE TRIGGER borrow_records_circulation_{event.lower()}
+            AFTER {event} ON borrow_records
+            REFERENCING {transition}
+            FOR EACH STATEMENT EXECUTE FUNCTION log_circulation_events()
+        """)
+
+    op.execute(
+        "WITH loans AS ("
+        " SELECT book_id, borrow_date, returned_at, borrow_status FROM borrow_records"
+        " UNION ALL"
+        " SELECT book_id, borrow_date, returned_at, borrow_status FROM borrow_records_archive"
+        ") " + BACKFILL
+    )
+
+
+def downgrade() -> None:
+    for event in ('insert', 'update'):
+        op.execute(f"DROP TRIGGER IF EXISTS borrow_records_circulation_{event} ON borrow_records")
+    op.execute("DROP FUNCTION IF EXISTS log_circulation_events()")
+    op.drop_table('circulation_daily')
+    op.drop_table('circulation_events')
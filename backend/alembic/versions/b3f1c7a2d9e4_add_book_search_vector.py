@@ -0,0 +1,47 @@
+"""Add book search vector
+
+Revision ID: b3f1c7a2d9e4
+Revises: 7d512f8528ba
+Create Date: 2026-10-18 09:12:31.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f1c7a2d9e4'
+down_revision: Union[str, None] = '7d512f8528ba'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('english', coalesce(book_title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(book_author, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(book_category, '')), 'C') || "
+    "setweight(to_tsvector('english', coalesce(book_description, '')), 'D')"
+)
+
+
+def upgrade() -> None:
+    # Stored generated column: Postgres keeps it current on every INSERT/UPDATE.
+    op.add_column(
+        'books',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        'ix_books_search_vector', 'books', ['search_vector'], unique=False, postgresql_using='gin'
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_books_search_vector', table_name='books', postgresql_using='gin')
+    op.drop_column('books', 'search_vector')
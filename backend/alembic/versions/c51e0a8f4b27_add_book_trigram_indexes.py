@@ -0,0 +1,35 @@
+"""Add book trigram indexes
+
+Revision ID: c51e0a8f4b27
+Revises: b3f1c7a2d9e4
+Create Date: 2026-10-18 10:04:52.640117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c51e0a8f4b27'
+down_revision: Union[str, None] = 'b3f1c7a2d9e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        'ix_books_book_title_trgm', 'books', ['book_title'], unique=False,
+        postgresql_using='gin', postgresql_ops={'book_title': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'ix_books_book_author_trgm', 'books', ['book_author'], unique=False,
+        postgresql_using='gin', postgresql_ops={'book_author': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_books_book_author_trgm', table_name='books')
+    op.drop_index('ix_books_book_title_trgm', table_name='books')
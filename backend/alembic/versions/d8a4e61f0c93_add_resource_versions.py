@@ -0,0 +1,68 @@
+"""Add resource versions for ETags
+
+Revision ID: d8a4e61f0c93
+Revises: c51e0a8f4b27
+Create Date: 2026-10-18 11:37:05.284413
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8a4e61f0c93'
+down_revision: Union[str, None] = 'c51e0a8f4b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Per-row version on books, bumped by the database so every write path counts.
+    op.add_column('books', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_row_version() RETURNS trigger AS $$
+        BEGIN
+            NEW.version := OLD.version + 1;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER books_bump_version
+        BEFORE UPDATE ON books
+        FOR EACH ROW EXECUTE FUNCTION bump_row_version()
+    """)
+
+    # Collection-level counters for categories and settings.
+    op.create_table('resource_versions',
+    sa.Column('resource', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('resource')
+    )
+    op.execute("INSERT INTO resource_versions (resource, version) VALUES ('categories', 1), ('settings', 1)")
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_resource_version() RETURNS trigger AS $$
+        BEGIN
+            UPDATE resource_versions SET version = version + 1 WHERE resource = TG_TABLE_NAME;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    for table in ('categories', 'settings'):
+        op.execute(f"""
+            CREATE TRIGGER {table}_bump_resource_version
+            AFTER INSERT OR UPDATE OR DELETE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_resource_version()
+        """)
+
+
+def downgrade() -> None:
+    for table in ('categories', 'settings'):
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_bump_resource_version ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS bump_resource_version()")
+    op.drop_table('resource_versions')
+    op.execute("DROP TRIGGER IF EXISTS books_bump_version ON books")
+    op.execute("DROP FUNCTION IF EXISTS bump_row_version()")
+    op.drop_column('books', 'version')
@@ -0,0 +1,50 @@
+"""Add indexes for hot catalog, borrow and review queries
+
+Revision ID: e2f7b9d41a6c
+Revises: d8a4e61f0c93
+Create Date: 2026-10-18 12:48:20.519734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2f7b9d41a6c'
+down_revision: Union[str, None] = 'd8a4e61f0c93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# name, table, columns, extra create_index kwargs
+INDEXES = [
+    ('ix_users_user_name', 'users', ['user_name'], {}),
+    ('ix_borrow_records_user_book_status', 'borrow_records', ['user_id', 'book_id', 'borrow_status'], {}),
+    ('ix_borrow_records_book_id', 'borrow_records', ['book_id'], {}),
+    ('ix_borrow_records_borrow_status', 'borrow_records', ['borrow_status'], {}),
+    ('ix_books_book_rating', 'books', [sa.text('book_rating DESC')], {}),
+    ('ix_books_created_at', 'books', [sa.text('created_at DESC')], {}),
+    ('ix_books_featured', 'books', ['book_id'], {'postgresql_where': sa.text('featured')}),
+    ('ix_book_reviews_book_id_created_at', 'book_reviews', ['book_id', 'created_at'], {}),
+    ('ix_user_rating_book_id_rating', 'user_rating', ['book_id', 'rating'], {}),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction; build without locking writes.
+    with op.get_context().autocommit_block():
+        for name, table, columns, kwargs in INDEXES:
+            op.create_index(
+                name, table, columns, unique=False,
+                postgresql_concurrently=True, if_not_exists=True, **kwargs,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name, table_name=table, postgresql_concurrently=True, if_exists=True,
+            )
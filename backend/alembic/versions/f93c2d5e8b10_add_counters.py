@@ -0,0 +1,133 @@
+"""Add trigger-maintained counters
+
+Revision ID: f93c2d5e8b10
+Revises: e2f7b9d41a6c
+Create Date: 2026-10-18 13:42:11.604927
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f93c2d5e8b10'
+down_revision: Union[str, None] = 'e2f7b9d41a6c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Statement-level triggers: one upsert per statement, however many rows it touched.
+# Counter rows are updated in name order so concurrent statements cannot deadlock.
+BUMP_COUNTERS = """
+    CREATE OR REPLACE FUNCTION bump_counters(deltas jsonb) RETURNS void AS $$
+        INSERT INTO counters (name, value)
+        SELECT key, value::bigint FROM jsonb_each_text(deltas)
+        WHERE value::bigint <> 0
+        ORDER BY key
+        ON CONFLICT (name) DO UPDATE SET value = counters.value + excluded.value
+    $$ LANGUAGE sql
+"""
+
+COUNT_ROWS = """
+    CREATE OR REPLACE FUNCTION count_rows() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            PERFORM bump_counters(jsonb_build_object(TG_TABLE_NAME, (SELECT count(*) FROM new_rows)));
+        ELSE
+            PERFORM bump_counters(jsonb_build_object(TG_TABLE_NAME, -(SELECT count(*) FROM old_rows)));
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+COUNT_BORROW_STATUSES = """
+    CREATE OR REPLACE FUNCTION count_borrow_statuses() RETURNS trigger AS $$
+    DECLARE
+        deltas jsonb;
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            SELECT jsonb_object_agg(name, n) INTO deltas FROM (
+                SELECT 'borrow_status:' || coalesce(borrow_status, 'none') AS name, count(*) AS n
+                FROM new_rows GROUP BY 1
+            ) d;
+        ELSIF TG_OP = 'DELETE' THEN
+            SELECT jsonb_object_agg(name, -n) INTO deltas FROM (
+                SELECT 'borrow_status:' || coalesce(borrow_status, 'none') AS name, count(*) AS n
+                FROM old_rows GROUP BY 1
+            ) d;
+        ELSE
+            SELECT jsonb_object_agg(name, n) INTO deltas FROM (
+                SELECT name, sum(delta) AS n FROM (
+                    SELECT 'borrow_status:' || coalesce(n.borrow_status, 'none') AS name, 1 AS delta
+                    FROM new_rows n JOIN old_rows o USING (borrow_id)
+                    WHERE n.borrow_status IS DISTINCT FROM o.borrow_status
+                    UNION ALL
+                    SELECT 'borrow_status:' || coalesce(o.borrow_status, 'none'), -1
+                    FROM new_rows n JOIN old_rows o USING (borrow_id)
+                    WHERE n.borrow_status IS DISTINCT FROM o.borrow_status
+                ) changes GROUP BY name
+            ) d;
+        END IF;
+        IF deltas IS NOT NULL THEN
+            PERFORM bump_counters(deltas);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+
+def _statement_triggers(table: str, function: str, events) -> None:
+    for event in events:
+        transition = {
+            'INSERT': 'NEW TABLE AS new_rows',
+            'DELETE': 'OLD TABLE AS old_rows',
+            'UPDATE': 'OLD TABLE AS old_rows NEW TABLE AS new_rows',
+        }[event]
+        op.execute(f"""
+            CREATE TRIGGER {table}_counters_{event.lower()}
+            AFTER {event} ON {table}
+            REFERENCING {transition}
+            FOR EACH STATEMENT EXECUTE FUNCTION {function}()
+        """)
+
+
+def upgrade() -> None:
+    op.create_table('counters',
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('value', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.execute(BUMP_COUNTERS)
+    op.execute(COUNT_ROWS)
+    op.execute(COUNT_BORROW_STATUSES)
+    _statement_triggers('books', 'count_rows', ('INSERT', 'DELETE'))
+    _statement_triggers('users', 'count_rows', ('INSERT', 'DELETE'))
+    _statement_triggers('borrow_records', 'count_borrow_statuses', ('INSERT', 'UPDATE', 'DELETE'))
+
+    op.execute("""
+        INSERT INTO counters (name, value)
+        SELECT 'books', count(*) FROM books
+        UNION ALL
+        SELECT 'users', count(*) FROM users
+        UNION ALL
+        SELECT 'borrow_status:' || coalesce(borrow_status, 'none'), count(*)
+        FROM borrow_records GROUP BY 1
+    """)
+
+
+def downgrade() -> None:
+    for table, events in (
+        ('books', ('insert', 'delete')),
+        ('users', ('insert', 'delete')),
+        ('borrow_records', ('insert', 'update', 'delete')),
+    ):
+        for event in events:
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_counters_{event} ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS count_borrow_statuses()")
+    op.execute("DROP FUNCTION IF EXISTS count_rows()")
+    op.execute("DROP FUNCTION IF EXISTS bump_counters(jsonb)")
+    op.drop_table('counters')
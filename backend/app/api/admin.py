@@ -3,10 +3,11 @@ from pydantic import BaseModel, EmailStr
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.crud.user import UserCRUD
 from app.dependencies import get_db
-from app.core.security import create_access_token, get_current_user
+from app.core.security import create_access_token, get_current_user, get_current_admin
 from typing import Optional, List
 from app.models.user import User
 from app.schemas.admin import CreateUserRequest, CreateUserResponse
+from app.utils.cache import response_cache
 
 
 
@@ -42,3 +43,8 @@ async def create_user(
         role=user.role
     )
 
+
+@router.get("/cache/stats")
+async def get_cache_stats(current_user: User = Depends(get_current_admin)):
+    """Response cache hit/miss counters, for sizing RESPONSE_CACHE_* settings."""
+    return response_cache.stats()
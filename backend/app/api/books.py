@@ -1,38 +1,145 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Form
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, UploadFile, File, Form
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional, Dict
-from app.crud.book import BookCRUD
-from fastapi_pagination import Page, paginate
+from typing import List, Literal, Optional, Dict
+from app.crud.book import BookCRUD, home_feed
+from app.crud.book_import import IMPORT_FORMATS, BookImportCRUD
+from fastapi_pagination import Params
 from app.database import get_db
-from app.schemas.book import BookDetail, BookCreate, BookUpdate, RateBook, UpoadateFeatures
+from app.schemas.book import BookBundle, BookDetail, BookCreate, BookCursorPage, BookHomeFeed, BookImportResult, BookPage, BookSuggestion, BookUpdate, RateBook, UpoadateFeatures
+from app.core.exceptions import validation_error
 from app.core.security import get_current_user, get_current_admin
 from app.models.user import User
+from app.utils.cache import book_tag, response_cache
+from app.utils.etag import etag_matches, make_etag, not_modified
+from app.utils.export import EXPORT_FORMATS, EXPORT_WRITERS
+from app.utils.fields import parse_fields, project
+from app.utils.serialization import dump_json, json_response, raw_json_response
 from app.utils.minio_utils import upload_file
-from fastapi_pagination import Page, paginate 
-from typing import Dict
+from app.utils.pagination import decode_cursor, encode_cursor
 
 
 router = APIRouter(prefix="", tags=["Books"])
 book_crud = BookCRUD()
 
 
-@router.get("/", response_model=Page[BookDetail])
+def book_fields(
+    fields: Optional[str] = Query(
+        None,
+        description="'summary' or a comma-separated list of BookDetail fields; "
+        "only those columns are loaded and returned",
+    ),
+) -> Optional[List[str]]:
+    return parse_fields(
+        fields,
+        allowed=book_crud.EXPORT_COLUMNS,
+        presets=book_crud.FIELD_PRESETS,
+        always=["book_id"],
+    )
+
+
+@router.get("/", response_model=BookPage)
 async def get_books(
     db: AsyncSession = Depends(get_db),
     search: Optional[str] = Query(None, description="Search by title, author, or description"),
     category: Optional[str] = Query(None, description="Filter by category"),
+    count: Literal["exact", "estimate"] = Query(
+        "exact", description="Total: exact COUNT or cheap planner estimate"
+    ),
+    facets: bool = Query(False, description="Include facet counts for the filtered books"),
+    fields: Optional[List[str]] = Depends(book_fields),
+    params: Params = Depends(),
 ):
-    books = await book_crud.get_all(db, search=search, category=category)
-    return paginate(books)
+    raw = params.to_raw_params()
+    books, total = await book_crud.get_all(
+        db,
+        search=search,
+        category=category,
+        skip=raw.offset,
+        limit=raw.limit,
+        count=count,
+        fields=fields,
+    )
+    facet_counts = (
+        await book_crud.get_facets(db, search=search, category=category)
+        if facets
+        else None
+    )
+    capped = book_crud.search_capped(search, total)
+    if fields:
+        page = BookPage.create(
+            [], params, total=total, facets=facet_counts, search_capped=capped
+        )
+        return raw_json_response(
+            orjson.dumps({**page.model_dump(mode="json"), "items": project(books, fields)})
+        )
+    page = BookPage.create(
+        books, params, total=total, facets=facet_counts, search_capped=capped
+    )
+    return raw_json_response(page.model_dump_json().encode())
 
-@router.get("/count", tags=["Public Books"])
-async def count_books(db: AsyncSession = Depends(get_db)) -> Dict[str, int]:
+
+@router.get("/scroll", response_model=BookCursorPage)
+async def scroll_books(
+    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    size: int = Query(50, ge=1, le=100),
+    search: Optional[str] = Query(None, description="Search by title, author, or description"),
+    category: Optional[str] = Query(None, description="Filter by category"),
+    fields: Optional[List[str]] = Depends(book_fields),
+):
     """
-    Returns the total number of books in the library.
-    Example response: {"total_books": 123}
+    Keyset pagination ordered by book_id; cost stays flat however deep you scroll.
     """
-    total = await BookCRUD.count_books(db)
-    return {"count": total}
+    after = decode_cursor(cursor, 1)[0] if cursor else None
+    if after is not None and not isinstance(after, int):
+        raise validation_error({"cursor": "INVALID_CURSOR"})
+    books, has_more = await book_crud.get_after(
+        db, after=after, search=search, category=category, limit=size, fields=fields
+    )
+    next_cursor = encode_cursor(books[-1].book_id) if has_more else None
+    if fields:
+        return raw_json_response(
+            orjson.dumps({"items": project(books, fields), "next_cursor": next_cursor})
+        )
+    return json_response(BookCursorPage, {"items": books, "next_cursor": next_cursor})
+
+
+@router.get("/export")
+async def export_books(
+    format: Literal["csv", "ndjson"] = Query("csv"),
+    search: Optional[str] = Query(None, description="Search by title, author, or description"),
+    category: Optional[str] = Query(None, description="Filter by category"),
+    current_user: User = Depends(get_current_admin),
+):
+    """
+    Download the catalog (admin). Rows are streamed from a server-side
+    cursor, so memory use does not grow with the catalog. A search export
+    from a capped backend sends X-Search-Max-Hits.
+    """
+    batches = book_crud.stream_export(search=search, category=category)
+    headers = {"Content-Disposition": f'attachment; filename="books.{format}"'}
+    max_hits = book_crud.search_backend.max_hits
+    if search and max_hits is not None:
+        headers["X-Search-Max-Hits"] = str(max_hits)
+    return StreamingResponse(
+        EXPORT_WRITERS[format](book_crud.EXPORT_COLUMNS, batches),
+        media_type=EXPORT_FORMATS[format],
+        headers=headers,
+    )
+
+
+@router.get("/suggest", response_model=List[BookSuggestion])
+async def suggest_books(
+    q: str = Query(..., min_length=2, description="Partial title or author"),
+    limit: int = Query(10, ge=1, le=20),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Typo-tolerant autocomplete for the search box (trigram indexes).
+    """
+    return await book_crud.suggest(db, q.strip(), limit=limit)
 
 @router.get("/count", tags=["Public Books"])
 async def count_books(db: AsyncSession = Depends(get_db)) -> Dict[str, int]:
@@ -44,30 +151,114 @@ async def count_books(db: AsyncSession = Depends(get_db)) -> Dict[str, int]:
     return {"count": total}
 
 
+@router.get("/home", response_model=BookHomeFeed)
+async def get_home_feed():
+    """
+    Featured, popular and new books in one call, served from an in-memory
+    snapshot that is rebuilt in the background after catalog changes.
+    503 if the snapshot could not be built yet.
+    """
+    return raw_json_response(await home_feed.get())
+
+
+async def _cached_list(
+    name: str,
+    load,
+    db: AsyncSession,
+    skip: int,
+    limit: int,
+    fields: Optional[List[str]] = None,
+):
+    """
+    Serve a book list from the response cache, stored as encoded JSON.
+    Entries are tagged with the list name and with every book they contain,
+    so editing one of those books (or the list membership) evicts them.
+    """
+    key = (name, skip, limit, tuple(fields or ()))
+    content = response_cache.get(key)
+    if content is None:
+        loaded = await load(db, skip=skip, limit=limit, fields=fields)
+        content = (
+            orjson.dumps(project(loaded, fields))
+            if fields
+            else dump_json(List[BookDetail], loaded)
+        )
+        tags = [f"list:{name}", *(book_tag(b.book_id) for b in loaded)]
+        response_cache.set(key, content, tags=tags)
+    return raw_json_response(content)
+
+
 @router.get("/featured_book", response_model=List[BookDetail])
 async def get_featured_books(
     db: AsyncSession = Depends(get_db),
-    skip: int = 0, limit: int = 20
+    skip: int = 0, limit: int = 20,
+    fields: Optional[List[str]] = Depends(book_fields),
 ):
-    return await book_crud.get_featured(db, skip=skip, limit=limit)
+    return await _cached_list("featured", book_crud.get_featured, db, skip, limit, fields)
 
 
 @router.get("/popular", response_model=List[BookDetail])
 async def get_popular_books(db: AsyncSession = Depends(get_db),
-                            skip: int = 0, limit: int = 20):
-    return await book_crud.get_popular(db, skip=skip, limit=limit)
+                            skip: int = 0, limit: int = 20,
+                            fields: Optional[List[str]] = Depends(book_fields)):
+    return await _cached_list("popular", book_crud.get_popular, db, skip, limit, fields)
 
 
 @router.get("/new", response_model=List[BookDetail])
-async def get_new_books(db: AsyncSession = Depends(get_db), skip: int = 0, limit: int = 20):
-    return await book_crud.get_new(db, skip=skip, limit=limit)
+async def get_new_books(db: AsyncSession = Depends(get_db), skip: int = 0, limit: int = 20,
+                        fields: Optional[List[str]] = Depends(book_fields)):
+    return await _cached_list("new", book_crud.get_new, db, skip, limit, fields)
 
 
-@router.get("/{book_id}", response_model=BookDetail)
-async def get_book(book_id: int, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
-    book = await book_crud.get_by_id(db, book_id)
-    if not book:
+@router.get("/{book_id}/bundle", response_model=BookBundle)
+async def get_book_bundle(
+    book_id: int,
+    reviews: int = Query(10, ge=0, le=50, description="Number of newest reviews"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Book page in one request: book, rating histogram, newest reviews with
+    usernames and the caller's active borrow (a fixed four queries).
+    """
+    bundle = await book_crud.get_bundle(
+        db, book_id, current_user.user_id, review_limit=reviews
+    )
+    if not bundle:
         raise HTTPException(status_code=404, detail="Book not found")
+    return bundle
+
+
+@router.get("/{book_id}", response_model=BookDetail)
+async def get_book(
+    book_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Honours If-None-Match: the ETag is the book's row version, so a client
+    that already holds the current copy gets a bodyless 304.
+    """
+    cached = response_cache.get(("book", book_id))
+    if cached is None:
+        version = await book_crud.get_version(db, book_id)
+        if version is None:
+            raise HTTPException(status_code=404, detail="Book not found")
+        etag = make_etag("book", book_id, version)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        book = await book_crud.get_by_id(db, book_id)
+        if not book:
+            raise HTTPException(status_code=404, detail="Book not found")
+        cached = (book.version, BookDetail.model_validate(book, from_attributes=True))
+        response_cache.set(("book", book_id), cached, tags=[book_tag(book_id)])
+    version, book = cached
+    etag = make_etag("book", book_id, version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
     return book
 
 
@@ -109,6 +300,25 @@ async def create_book(
     return await book_crud.create(db, payload)
 
 
+@router.post("/import", response_model=BookImportResult)
+async def import_books(
+    file: UploadFile = File(..., description="CSV with a header row, or JSON Lines"),
+    format: Optional[Literal["csv", "jsonl"]] = Query(
+        None, description="Defaults to the file extension"
+    ),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_admin),
+):
+    """
+    Bulk-add books (admin). Rows whose title and author already exist are
+    skipped; invalid rows are reported by line number.
+    """
+    fmt = format or (file.filename or "").rsplit(".", 1)[-1].lower()
+    if fmt not in IMPORT_FORMATS:
+        raise validation_error({"format": "UNSUPPORTED_FORMAT"})
+    return await BookImportCRUD.import_books(db, file.file, fmt)
+
+
 @router.patch("/{book_id}", response_model=BookDetail)
 async def update_book(
     book_id: int,
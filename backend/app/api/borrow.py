@@ -1,9 +1,10 @@
 
 
 
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Literal, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
@@ -18,7 +19,15 @@ from app.schemas.borrow import (
     BorrowCountResponse,
     BorrowDetailResponse,
     BorrowRequestRecord,
+    BorrowLedgerPage,
+    BorrowBulkStatusUpdate,
+    BorrowBulkStatusResult,
+    BorrowSummary,
+    LoanStatus,
 )
+from app.core.exceptions import validation_error
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.serialization import json_response
 
 
 
@@ -45,12 +54,67 @@ async def get_all_borrowed_books(
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Not authorized")
 
-    return await BorrowCRUD.get_all_borrows_admin(db)
+    rows = await BorrowCRUD.get_all_borrows_admin(db)
+    return json_response(List[BorrowDetailResponse], rows)
 
 
 
 
 
+@router.get("/borrow/ledger", response_model=BorrowLedgerPage)
+async def get_borrow_ledger(
+    status: Optional[List[str]] = Query(None, description="One or more borrow statuses"),
+    user_id: Optional[str] = None,
+    book_id: Optional[int] = None,
+    borrowed_from: Optional[date] = None,
+    borrowed_to: Optional[date] = None,
+    due_from: Optional[date] = Query(None, description="return_date on or after"),
+    due_to: Optional[date] = Query(None, description="return_date on or before"),
+    sort: Literal[
+        "borrow_id", "-borrow_id", "borrow_date", "-borrow_date", "return_date", "-return_date"
+    ] = "-borrow_id",
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    size: int = Query(50, ge=1, le=200),
+    include_archived: bool = Query(False, description="Also page through archived loans"),
+    db: AsyncSession = Depends(get_db),
+    current_user: models.user.User = Depends(get_current_admin),
+):
+    """
+    Admin: every loan, filtered and keyset-paginated (newest first by default).
+    """
+    after = None
+    if cursor:
+        cursor_sort, value, last_id = decode_cursor(cursor, 3)
+        if cursor_sort != sort or not isinstance(last_id, int):
+            raise validation_error({"cursor": "INVALID_CURSOR"})
+        if value is not None and sort.lstrip("-") != "borrow_id":
+            try:
+                value = date.fromisoformat(value)
+            except (TypeError, ValueError):
+                raise validation_error({"cursor": "INVALID_CURSOR"})
+        after = [value, last_id]
+
+    rows, has_more = await BorrowCRUD.get_ledger(
+        db,
+        statuses=status,
+        user_id=user_id,
+        book_id=book_id,
+        borrowed_from=borrowed_from,
+        borrowed_to=borrowed_to,
+        due_from=due_from,
+        due_to=due_to,
+        sort=sort,
+        after=after,
+        limit=size,
+        include_archived=include_archived,
+    )
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = encode_cursor(sort, getattr(last, sort.lstrip("-")), last.borrow_id)
+    return json_response(BorrowLedgerPage, {"items": rows, "next_cursor": next_cursor})
+
+
 @router.post("/borrow/", response_model=BorrowRecord)
 async def borrow_book(
     borrow: BorrowCreate,
@@ -83,20 +147,51 @@ async def borrow_pdf(
 
 @router.get("/borrow/my", response_model=List[BorrowDetailResponse])
 async def get_my_borrowed_books(
+    include_archived: bool = Query(False, description="Include archived (old closed) loans"),
     db: AsyncSession = Depends(get_db),
     current_user: models.user.User = Depends(get_current_active_user),
 ):
     """
     User can see only their own borrow requests with book and user details.
     """
-    return await BorrowCRUD.get_my_borrow(db, user_id=current_user.user_id)
+    rows = await BorrowCRUD.get_my_borrow(
+        db, user_id=current_user.user_id, include_archived=include_archived
+    )
+    return json_response(List[BorrowDetailResponse], rows)
 
 
 
+@router.get("/borrow/summary", response_model=BorrowSummary)
+async def get_borrow_summary(
+    db: AsyncSession = Depends(get_db),
+    current_user: models.user.User = Depends(get_current_active_user),
+):
+    """
+    Loan counts for every status in one call: the caller's own loans, or
+    library-wide for admins.
+    """
+    user_id = None if current_user.role == "admin" else current_user.user_id
+    return await BorrowCRUD.get_summary(db, user_id)
+
+
+@router.post("/borrow/status/bulk", response_model=BorrowBulkStatusResult)
+async def bulk_update_borrow_status(
+    payload: BorrowBulkStatusUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: models.user.User = Depends(get_current_admin),
+):
+    """
+    Admin: approve, return or reject many loans in one transaction.
+    Each change is reported in `results`; invalid ids and closed loans that
+    would be reopened don't fail the batch.
+    """
+    return await BorrowCRUD.bulk_update_status(db, payload.changes)
+
+
 @router.patch("/borrow/{borrow_id}/status", response_model=BorrowDetailResponse)
 async def update_borrow_status(
     borrow_id: int,
-    status: str,
+    status: LoanStatus,
     db: AsyncSession = Depends(get_db),
     current_user: models.user.User = Depends(get_current_active_user),
 ):
@@ -149,9 +244,8 @@ async def get_borrow_status_list(
 
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Not authorized")
-    result = await BorrowCRUD.list_by_borrow_status(db, status=status)
-    print("result :", result)
-    return result
+    rows = await BorrowCRUD.list_by_borrow_status(db, status=status)
+    return json_response(List[BorrowRequestRecord], rows)
 
 
 
@@ -186,7 +280,8 @@ async def get_borrow_status_list(
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Not authorized")
 
-    return await BorrowCRUD.list_by_request_status(db, status=status)
+    rows = await BorrowCRUD.list_by_request_status(db, status=status)
+    return json_response(List[BorrowRequestRecord], rows)
 
 
 
@@ -212,7 +307,8 @@ async def get_borrow_status_list(
 ):
     
     user_id = None if current_user.role == "admin" else current_user.user_id
-    return await BorrowCRUD.list_my_borrow_status(db, status=status, user_id=user_id)
+    rows = await BorrowCRUD.list_my_borrow_status(db, status=status, user_id=user_id)
+    return json_response(List[BorrowRequestRecord], rows)
 
 
 
@@ -237,7 +333,8 @@ async def get_request_status_list(
 ):
    
     user_id = None if current_user.role == "admin" else current_user.user_id
-    return await BorrowCRUD.list_my_request_status(db, status=status, user_id=user_id)
+    rows = await BorrowCRUD.list_my_request_status(db, status=status, user_id=user_id)
+    return json_response(List[BorrowRecord], rows)
 
 
 
@@ -1,13 +1,15 @@
 
-from fastapi import APIRouter, Depends, Query, HTTPException, status
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
 from app.dependencies import get_db, get_current_admin, get_current_user
 from app.schemas.category import CategoryOut, CategoryUpdate, CategoryCreate
 from app.crud.category import CategoryCRUD
+from app.crud.resource_version import ResourceVersionCRUD
 from app.models.user import User
 from app.core.exceptions import not_found_error, conflict_error
+from app.utils.etag import etag_matches, make_etag, not_modified
 
 router = APIRouter(
     prefix="",
@@ -17,11 +19,19 @@ router = APIRouter(
 
 @router.get("/all", response_model=List[CategoryOut])
 async def list_categories(
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
    
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100)
 ):
+    version = await ResourceVersionCRUD.get_version(db, "categories")
+    etag = make_etag("categories", version, page, page_size)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+
     skip = (page - 1) * page_size
     categories = await CategoryCRUD.get_categories(db, skip=skip, limit=page_size)
     
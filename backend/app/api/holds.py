@@ -0,0 +1,56 @@
+from typing import List
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.book_hold import BookHoldCRUD
+from app.crud.borrow import BorrowCRUD
+from app.core.security import get_current_user
+from app.database import get_db
+from app.models.user import User
+from app.schemas.book_hold import HoldCreate, HoldOut
+from app.schemas.borrow import BorrowRecord
+
+router = APIRouter()
+
+
+@router.post("/", response_model=HoldOut)
+async def place_hold(
+    hold: HoldCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Queue for a book with no copy on the shelf. The next returned copy is
+    set aside for the oldest hold, which then shows as `ready` until
+    `expires_at`.
+    """
+    return await BookHoldCRUD.place_hold(db, current_user, hold.book_id)
+
+
+@router.get("/my", response_model=List[HoldOut])
+async def list_my_holds(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    return await BookHoldCRUD.list_my_holds(db, current_user.user_id)
+
+
+@router.post("/{hold_id}/claim", response_model=BorrowRecord)
+async def claim_hold(
+    hold_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Borrow the copy set aside for a ready hold."""
+    return await BorrowCRUD.claim_hold(db, current_user, hold_id)
+
+
+@router.delete("/{hold_id}", status_code=204)
+async def cancel_hold(
+    hold_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    await BookHoldCRUD.cancel_hold(db, current_user, hold_id)
+    return None
@@ -0,0 +1,38 @@
+from datetime import date, timedelta
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import validation_error
+from app.core.security import get_current_admin
+from app.crud.circulation import CirculationCRUD
+from app.database import get_db
+from app.models.user import User
+from app.schemas.report import CirculationReport
+
+router = APIRouter()
+
+
+@router.get("/circulation", response_model=CirculationReport)
+async def circulation_report(
+    date_from: Optional[date] = Query(None, description="First day (default: 30 days ago)"),
+    date_to: Optional[date] = Query(None, description="Last day, inclusive (default: today)"),
+    group_by: Literal["day", "category", "book"] = "day",
+    category: Optional[str] = None,
+    book_id: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_db),
+    admin: User = Depends(get_current_admin),
+):
+    """
+    Admin: borrows, returns, rejections, overdues and PDF views, read from
+    the daily rollups (refreshed every CIRCULATION_ROLLUP_SECONDS).
+    """
+    date_to = date_to or date.today()
+    date_from = date_from or date_to - timedelta(days=29)
+    if date_from > date_to:
+        raise validation_error({"date_from": "MUST_NOT_BE_AFTER_DATE_TO"})
+    return await CirculationCRUD.get_report(
+        db, date_from, date_to, group_by, category=category, book_id=book_id, limit=limit
+    )
@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.dependencies import get_db, get_current_admin
+from app.crud.resource_version import ResourceVersionCRUD
 from app.models.user import User
 from app.models.settings import Settings
 from app.schemas.settings import SettingsResponse, SettingsUpdate
+from app.utils.etag import etag_matches, make_etag, not_modified
 
 router = APIRouter()
 
@@ -43,7 +45,15 @@ async def update_settings_admin(
 
 
 @router.get("/public", response_model=SettingsResponse, tags=["Public Settings"])
-async def get_public_settings(db: AsyncSession = Depends(get_db)):
+async def get_public_settings(
+    request: Request, response: Response, db: AsyncSession = Depends(get_db)
+):
+    version = await ResourceVersionCRUD.get_version(db, "settings")
+    etag = make_etag("settings", version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+
     result = await db.execute(select(Settings).limit(1))
     setting = result.scalars().first()
     if not setting:
@@ -0,0 +1,271 @@
+"""
+Maintenance commands.
+
+    CHECK_DATABASE_URL=... python -m app.cli check-checkout --attempts 50
+    python -m app.cli import-books books.csv
+    python -m app.cli reconcile-counters
+    python -m app.cli sweep-overdue
+    python -m app.cli expire-holds
+    python -m app.cli archive-borrows --older-than-days 365
+    python -m app.cli rollup-circulation
+    python -m app.cli reconcile-active-borrows
+"""
+import asyncio
+from collections import Counter
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Optional
+
+import typer
+from fastapi import HTTPException
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.crud.book_hold import BookHoldCRUD
+from app.crud.book_import import IMPORT_FORMATS, BookImportCRUD
+from app.crud.borrow import BorrowCRUD
+from app.crud.borrow_archive import BorrowArchiveCRUD
+from app.crud.circulation import CirculationCRUD
+from app.crud.counter import CounterCRUD
+from app.crud.user import UserCRUD
+from app.database import async_session, engine
+from app.models.book import Book
+from app.models.borrow import BorrowRecord
+from app.models.user import User
+from app.schemas.borrow import BorrowCreate
+from app.utils.scratch_db import check_database_url, scratch_db
+
+cli = typer.Typer(help="LMS maintenance commands.", no_args_is_help=True)
+
+
+@cli.callback()
+def main():
+    pass
+
+
+def _check_database_url() -> str:
+    """CHECK_DATABASE_URL; the check commands refuse to run without one."""
+    try:
+        return check_database_url()
+    except ValueError as exc:
+        typer.echo(str(exc), err=True)
+        raise typer.Exit(code=2)
+
+
+async def _check_checkout(url: str, attempts: int) -> dict:
+    async with scratch_db(url) as scratch:
+        session = sessionmaker(bind=scratch, class_=AsyncSession, expire_on_commit=False)
+        async with scratch.begin() as conn:
+            book_id = (
+                await conn.execute(
+                    insert(Book)
+                    .values(
+                        book_title="Last copy",
+                        book_category="Check",
+                        book_author="Check",
+                        available_copies=1,
+                        book_availabity=True,
+                    )
+                    .returning(Book.book_id)
+                )
+            ).scalar_one()
+
+        async def checkout(n: int) -> str:
+            borrow = BorrowCreate(book_id=book_id, return_date=date.today() + timedelta(days=7))
+            async with session() as db:
+                try:
+                    await BorrowCRUD.create_borrow(db, borrow, User(user_id=f"u{n}"))
+                except HTTPException as exc:
+                    return exc.detail
+            return "ok"
+
+        lowest = 1
+        done = asyncio.Event()
+
+        async def watch():
+            nonlocal lowest
+            async with scratch.connect() as conn:
+                while not done.is_set():
+                    copies = await conn.scalar(
+                        select(Book.available_copies).where(Book.book_id == book_id)
+                    )
+                    lowest = min(lowest, copies)
+                    await conn.rollback()
+                    await asyncio.sleep(0)
+
+        watcher = asyncio.create_task(watch())
+        outcomes = await asyncio.gather(*(checkout(n) for n in range(1, attempts + 1)))
+        done.set()
+        await watcher
+
+        async with scratch.connect() as conn:
+            copies = await conn.scalar(
+                select(Book.available_copies).where(Book.book_id == book_id)
+            )
+            loans = await conn.scalar(
+                select(func.count()).where(BorrowRecord.book_id == book_id)
+            )
+    return {
+        "outcomes": Counter(outcomes),
+        "copies": copies,
+        "lowest": min(lowest, copies),
+        "loans": loans,
+    }
+
+
+@cli.command("check-checkout")
+def check_checkout(
+    attempts: int = typer.Option(50, min=2, max=200, help="Concurrent checkouts"),
+):
+    """
+    Fail if concurrent checkouts can oversell: `attempts` users race for a
+    book's last copy, exactly one may get it and available_copies must never
+    drop below 0. Runs in a seeded throwaway schema on CHECK_DATABASE_URL.
+    """
+    url = _check_database_url()
+    result = asyncio.run(_check_checkout(url, attempts))
+    for outcome, n in sorted(result["outcomes"].items()):
+        typer.echo(f"{n:>5}  {outcome}")
+    typer.echo(
+        f"{result['loans']} loan(s), {result['copies']} copies left, "
+        f"lowest seen {result['lowest']}"
+    )
+    if (
+        result["outcomes"]["ok"] != 1
+        or result["loans"] != 1
+        or result["copies"] != 0
+        or result["lowest"] < 0
+    ):
+        typer.echo("FAIL  checkout oversold the last copy")
+        raise typer.Exit(code=1)
+    typer.echo("ok    exactly one checkout got the last copy")
+
+
+async def _import_books(path: Path, fmt: str):
+    async with async_session() as db:
+        with path.open("rb") as stream:
+            result = await BookImportCRUD.import_books(db, stream, fmt)
+    await engine.dispose()
+    return result
+
+
+@cli.command("import-books")
+def import_books(
+    path: Path = typer.Argument(..., exists=True, dir_okay=False),
+    fmt: Optional[str] = typer.Option(None, "--format", help="csv or jsonl"),
+):
+    """Bulk-load books from a CSV or JSONL file."""
+    engine.echo = False
+    fmt = fmt or path.suffix.lstrip(".").lower()
+    if fmt not in IMPORT_FORMATS:
+        raise typer.BadParameter(f"format must be one of {', '.join(IMPORT_FORMATS)}")
+    result = asyncio.run(_import_books(path, fmt))
+    for error in result.errors:
+        typer.echo(f"line {error.line}: {error.errors}", err=True)
+    typer.echo(
+        f"{result.imported} imported, {result.skipped_duplicates} duplicates skipped, "
+        f"{result.failed} failed of {result.total_rows} rows"
+    )
+    if result.failed:
+        raise typer.Exit(code=1)
+
+
+async def _reconcile_counters():
+    async with async_session() as db:
+        drift = await CounterCRUD.reconcile(db)
+    await engine.dispose()
+    return drift
+
+
+@cli.command("reconcile-counters")
+def reconcile_counters():
+    """Recount the dashboard counters and repair any drift."""
+    engine.echo = False
+    drift = asyncio.run(_reconcile_counters())
+    for name, correction in drift.items():
+        typer.echo(f"{name}: {correction:+d}")
+    typer.echo(f"{len(drift)} counter(s) repaired")
+
+
+async def _reconcile_active_borrows():
+    async with async_session() as db:
+        drift = await UserCRUD.reconcile_active_borrows(db)
+    await engine.dispose()
+    return drift
+
+
+@cli.command("reconcile-active-borrows")
+def reconcile_active_borrows():
+    """Recount each user's active loans and repair active_borrow_count."""
+    engine.echo = False
+    drift = asyncio.run(_reconcile_active_borrows())
+    for user_id, correction in drift.items():
+        typer.echo(f"{user_id}: {correction:+d}")
+    typer.echo(f"{len(drift)} user(s) repaired")
+
+
+async def _sweep_overdue():
+    async with async_session() as db:
+        flagged = await BorrowCRUD.mark_overdue(db)
+    await engine.dispose()
+    return flagged
+
+
+@cli.command("sweep-overdue")
+def sweep_overdue():
+    """Flag open loans past their return date as overdue."""
+    engine.echo = False
+    typer.echo(f"{asyncio.run(_sweep_overdue())} loan(s) marked overdue")
+
+
+async def _expire_holds():
+    async with async_session() as db:
+        expired = await BookHoldCRUD.expire_holds(db)
+    await engine.dispose()
+    return expired
+
+
+@cli.command("expire-holds")
+def expire_holds():
+    """Close lapsed book holds and pass their copies down the queue."""
+    engine.echo = False
+    typer.echo(f"{asyncio.run(_expire_holds())} hold(s) expired")
+
+
+async def _archive_borrows(older_than_days: Optional[int], batch_size: Optional[int]):
+    async with async_session() as db:
+        moved = await BorrowArchiveCRUD.archive_closed(db, older_than_days, batch_size)
+    await engine.dispose()
+    return moved
+
+
+@cli.command("archive-borrows")
+def archive_borrows(
+    older_than_days: Optional[int] = typer.Option(
+        None, help="Closed for at least this many days (default BORROW_ARCHIVE_AFTER_DAYS)"
+    ),
+    batch_size: Optional[int] = typer.Option(None, help="Loans moved per transaction"),
+):
+    """Move old closed loans from borrow_records to borrow_records_archive."""
+    engine.echo = False
+    moved = asyncio.run(_archive_borrows(older_than_days, batch_size))
+    typer.echo(f"{moved} loan(s) archived")
+
+
+async def _rollup_circulation():
+    async with async_session() as db:
+        processed = await CirculationCRUD.rollup(db)
+    await engine.dispose()
+    return processed
+
+
+@cli.command("rollup-circulation")
+def rollup_circulation():
+    """Fold queued loan changes into the circulation_daily rollups."""
+    engine.echo = False
+    typer.echo(f"{asyncio.run(_rollup_circulation())} event(s) rolled up")
+
+
+if __name__ == "__main__":
+    cli()
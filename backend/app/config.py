@@ -1,4 +1,6 @@
 # app/config.py
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 
@@ -8,6 +10,8 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 20000000
     MAX_BORROW_LIMIT: int = 5
+    # Days a ready hold is kept when the settings row has no booking_duration
+    DEFAULT_BOOKING_DURATION: int = 2
     ADMIN_EMAIL: str
     ADMIN_PASSWORD: str
     JWT_EXPIRATION_MINUTES: int = 60
@@ -17,6 +21,45 @@ class Settings(BaseSettings):
     MINIO_SECRET_KEY: str
     MINIO_BUCKET: str = "media"
 
+    # Catalog search: "postgres" (full-text) or "bm25" (in-process index)
+    SEARCH_BACKEND: str = "postgres"
+    SEARCH_INDEX_REFRESH_SECONDS: int = 300
+    # bm25 serves at most this many matches per search (pages report search_capped)
+    SEARCH_MAX_HITS: int = 1000
+
+    HOME_FEED_SIZE: int = 20
+    HOME_FEED_MAX_AGE_SECONDS: int = 60
+
+    RESPONSE_CACHE_TTL_SECONDS: int = 60
+    RESPONSE_CACHE_MAX_ENTRIES: int = 2048
+    BORROW_SUMMARY_TTL_SECONDS: int = 15
+
+    # Recount the dashboard counters and repair drift (0 disables)
+    COUNTERS_RECONCILE_SECONDS: int = 3600
+
+    # Flag loans past their return date as overdue (0 disables)
+    OVERDUE_SWEEP_SECONDS: int = 300
+
+    # Expire lapsed book holds and pass their copies on (0 disables)
+    HOLD_EXPIRY_SWEEP_SECONDS: int = 300
+
+    # Move closed loans older than BORROW_ARCHIVE_AFTER_DAYS to
+    # borrow_records_archive (0 disables)
+    BORROW_ARCHIVE_SECONDS: int = 86400
+    BORROW_ARCHIVE_AFTER_DAYS: int = 365
+    BORROW_ARCHIVE_BATCH_SIZE: int = 5000
+
+    # Fold queued loan changes into circulation_daily (0 disables)
+    CIRCULATION_ROLLUP_SECONDS: int = 60
+    CIRCULATION_ROLLUP_BATCH_SIZE: int = 10000
+
+    # Recount users.active_borrow_count and repair drift (0 disables)
+    ACTIVE_BORROWS_RECONCILE_SECONDS: int = 3600
+
+    # Database the query plan tests and check-* commands build their
+    # throwaway schema in; never the one in DATABASE_URL
+    CHECK_DATABASE_URL: Optional[str] = None
+
     class Config:
         env_file = ".env"
         extra = "allow"
@@ -59,3 +59,12 @@ def internal_error(message: str = "Internal server error"):
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         detail={"error": {"code": "INTERNAL_ERROR", "message": message, "details": {}}},
     )
+
+
+def service_unavailable_error(message: str = "Service unavailable"):
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail={
+            "error": {"code": "SERVICE_UNAVAILABLE", "message": message, "details": {}}
+        },
+    )
@@ -0,0 +1,118 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, List
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.crud.book_hold import BookHoldCRUD
+from app.crud.borrow import BorrowCRUD
+from app.crud.borrow_archive import BorrowArchiveCRUD
+from app.crud.circulation import CirculationCRUD
+from app.crud.counter import CounterCRUD
+from app.crud.user import UserCRUD
+from app.database import async_session
+from app.search.backends import get_search_backend
+
+logger = logging.getLogger(__name__)
+
+Job = Callable[[AsyncSession], Awaitable[object]]
+
+
+async def run_job(name: str, job: Job) -> None:
+    """Run `job` once in its own session; failures are logged, never raised."""
+    try:
+        async with async_session() as db:
+            await job(db)
+    except Exception:
+        logger.exception("Background job %s failed", name)
+
+
+async def run_periodically(name: str, interval_seconds: int, job: Job) -> None:
+    while True:
+        await asyncio.sleep(interval_seconds)
+        await run_job(name, job)
+
+
+def start_periodic(name: str, interval_seconds: int, job: Job) -> asyncio.Task:
+    return asyncio.create_task(
+        run_periodically(name, interval_seconds, job), name=f"job:{name}"
+    )
+
+
+async def start_background_jobs() -> List[asyncio.Task]:
+    """Warm in-process state and schedule the periodic jobs for this worker."""
+    tasks = []
+
+    search_backend = get_search_backend()
+    if search_backend.in_memory:
+        await run_job("search-index", search_backend.rebuild)
+        if settings.SEARCH_INDEX_REFRESH_SECONDS > 0:
+            tasks.append(
+                start_periodic(
+                    "search-index",
+                    settings.SEARCH_INDEX_REFRESH_SECONDS,
+                    search_backend.rebuild,
+                )
+            )
+
+    if settings.OVERDUE_SWEEP_SECONDS > 0:
+        await run_job("overdue-sweep", BorrowCRUD.mark_overdue)
+        tasks.append(
+            start_periodic(
+                "overdue-sweep", settings.OVERDUE_SWEEP_SECONDS, BorrowCRUD.mark_overdue
+            )
+        )
+
+    if settings.HOLD_EXPIRY_SWEEP_SECONDS > 0:
+        tasks.append(
+            start_periodic(
+                "hold-expiry",
+                settings.HOLD_EXPIRY_SWEEP_SECONDS,
+                BookHoldCRUD.expire_holds,
+            )
+        )
+
+    if settings.BORROW_ARCHIVE_SECONDS > 0:
+        tasks.append(
+            start_periodic(
+                "borrow-archive",
+                settings.BORROW_ARCHIVE_SECONDS,
+                BorrowArchiveCRUD.archive_closed,
+            )
+        )
+
+    if settings.CIRCULATION_ROLLUP_SECONDS > 0:
+        tasks.append(
+            start_periodic(
+                "circulation-rollup",
+                settings.CIRCULATION_ROLLUP_SECONDS,
+                CirculationCRUD.rollup,
+            )
+        )
+
+    if settings.COUNTERS_RECONCILE_SECONDS > 0:
+        tasks.append(
+            start_periodic(
+                "reconcile-counters",
+                settings.COUNTERS_RECONCILE_SECONDS,
+                CounterCRUD.reconcile,
+            )
+        )
+
+    if settings.ACTIVE_BORROWS_RECONCILE_SECONDS > 0:
+        tasks.append(
+            start_periodic(
+                "reconcile-active-borrows",
+                settings.ACTIVE_BORROWS_RECONCILE_SECONDS,
+                UserCRUD.reconcile_active_borrows,
+            )
+        )
+
+    return tasks
+
+
+async def stop_background_jobs(tasks: List[asyncio.Task]) -> None:
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
@@ -7,7 +7,7 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
-from app.database import async_session
+from app.database import get_db
 from app.crud.user import UserCRUD
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -41,11 +41,6 @@ def decode_access_token(token: str):
         return None
 
 
-async def get_db():
-    async with async_session() as session:
-        yield session
-
-
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncSession = Depends(get_db),
@@ -3,64 +3,227 @@ from typing import Optional, List
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import or_, desc, func
+from sqlalchemy import or_, desc, func, literal, tuple_, union_all
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import load_only
 from app import models, schemas
 from datetime import datetime
-from typing import Optional, List
+from typing import AsyncIterator, Optional, List, Sequence, Tuple
 from app.models.book import Book
+from app.models.book_review import BookReview
+from app.models.borrow import ACTIVE_BORROW_STATUSES, BorrowRecord
+from app.models.user import User
 from app.models.user_rating import UserRating
-from app.schemas.book import BookCreate, BookUpdate
+from app.config import settings
+from app.crud.counter import BOOKS, CounterCRUD
+from app.database import async_session
+from app.schemas.book import BookBundle, BookCreate, BookDetail, BookHomeFeed, BookSummary, BookUpdate
+from app.search.backends import get_search_backend
+from app.utils.cache import FACETS_TAG, book_tag, response_cache
+from app.utils.pagination import count_rows
+from app.utils.snapshot import Snapshot
 
 
 class BookCRUD:
     """CRUD operations for Book"""
 
+    EXPORT_COLUMNS = list(BookDetail.model_fields)
+    FIELD_PRESETS = {"summary": list(BookSummary.model_fields)}
+
     def __init__(self):
-        pass
+        self.search_backend = get_search_backend()
 
-    async def get_all(
+    def _filtered_query(
         self,
-        db: AsyncSession,
         search: Optional[str] = None,
         category: Optional[str] = None,
-    ) -> List[Book]:
-        query = select(Book)
+        fields: Optional[List[str]] = None,
+    ):
+        """
+        Books matching the filters, best match first when searching.
+        Matching and ranking are delegated to the configured search backend.
+        `fields` limits the columns loaded (sparse fieldsets).
+        """
+        query = _only(select(Book), fields)
 
         if search:
-            like_pattern = f"%{search.lower()}%"
-            query = query.filter(
-                or_(
-                    Book.book_title.ilike(like_pattern),
-                    Book.book_author.ilike(like_pattern),
-                    Book.book_description.ilike(like_pattern),
-                    Book.book_category.ilike(like_pattern),
-                )
-            )
+            query = self.search_backend.apply(query, search, category)
 
         if category:
             query = query.filter(Book.book_category == category)
 
-        result = await db.execute(query)
-        return result.scalars().unique().all()
+        return query.order_by(Book.book_id)
+
+    async def get_all(
+        self,
+        db: AsyncSession,
+        search: Optional[str] = None,
+        category: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 50,
+        count: str = "exact",
+        fields: Optional[List[str]] = None,
+    ) -> Tuple[List[Book], int]:
+        """
+        One page of books, paged with LIMIT/OFFSET in SQL.
+        `count` is "exact" or "estimate" (planner estimate, no scan).
+        """
+        query = self._filtered_query(search, category, fields)
+        total = await count_rows(db, query, count)
+
+        result = await db.execute(query.offset(skip).limit(limit))
+        return result.scalars().all(), total
+
+    def search_capped(self, search: Optional[str], total: int) -> bool:
+        """Whether a search total may have been cut off at the backend's max_hits."""
+        max_hits = self.search_backend.max_hits
+        return bool(search) and max_hits is not None and total >= max_hits
+
+    async def stream_export(
+        self,
+        search: Optional[str] = None,
+        category: Optional[str] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Sequence[tuple]]:
+        """
+        Yield the filtered catalog as batches of EXPORT_COLUMNS tuples from a
+        server-side cursor. Opens its own session because it outlives the
+        request handler (it is consumed by a StreamingResponse).
+        """
+        columns = [getattr(Book, name) for name in self.EXPORT_COLUMNS]
+        query = self._filtered_query(search, category).with_only_columns(*columns)
+        async with async_session() as db:
+            result = await db.stream(query.execution_options(yield_per=batch_size))
+            async for rows in result.partitions():
+                yield rows
+
+    async def get_facets(
+        self,
+        db: AsyncSession,
+        search: Optional[str] = None,
+        category: Optional[str] = None,
+    ) -> dict:
+        """
+        Facet counts over the filtered books in a single GROUPING SETS pass:
+        per category, availability, has-PDF, has-audio and rating band.
+        The pass reads every filtered book, so results are kept in the
+        response cache until a catalog or availability change.
+        """
+        cache_key = ("facets", search, category)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        books = self._filtered_query(search, category).order_by(None).subquery()
+        dimensions = {
+            "category": books.c.book_category,
+            "availability": func.coalesce(books.c.book_availabity, False),
+            "has_pdf": books.c.book_pdf.isnot(None),
+            "has_audio": books.c.book_audio.isnot(None),
+            "rating": func.least(func.floor(func.coalesce(books.c.book_rating, 0)), 4),
+        }
+        columns = [column.label(name) for name, column in dimensions.items()]
+        # grouping() is 0 only for the dimension of the row's own grouping set.
+        groupings = [
+            func.grouping(column).label(f"{name}_grouping")
+            for name, column in dimensions.items()
+        ]
+        result = await db.execute(
+            select(*columns, *groupings, func.count().label("count"))
+            .select_from(books)
+            .group_by(func.grouping_sets(*(tuple_(c) for c in dimensions.values())))
+        )
+
+        facets = {name: {} for name in dimensions}
+        for row in result.mappings():
+            name = next(name for name in dimensions if row[f"{name}_grouping"] == 0)
+            value = row[name]
+            if value is None:
+                key = "null"  # e.g. a book with no category
+            elif name == "rating":
+                key = f"{int(value)}-{int(value) + 1}"
+            elif isinstance(value, bool):
+                key = str(value).lower()
+            else:
+                key = value
+            facets[name][key] = row["count"]
+        response_cache.set(cache_key, facets, tags=[FACETS_TAG])
+        return facets
+
+    async def get_after(
+        self,
+        db: AsyncSession,
+        after: Optional[int] = None,
+        search: Optional[str] = None,
+        category: Optional[str] = None,
+        limit: int = 50,
+        fields: Optional[List[str]] = None,
+    ) -> Tuple[List[Book], bool]:
+        """
+        Keyset page ordered by book_id: the books after `after`.
+        Returns the page and whether more rows follow it.
+        """
+        query = self._filtered_query(search, category, fields).order_by(None)
+        if after is not None:
+            query = query.filter(Book.book_id > after)
+
+        result = await db.execute(query.order_by(Book.book_id).limit(limit + 1))
+        books = result.scalars().all()
+        return books[:limit], len(books) > limit
+
+    async def suggest(
+        self, db: AsyncSession, q: str, limit: int = 10
+    ) -> List[dict]:
+        """
+        Title/author completions for `q`, ranked by trigram word similarity.
+        `q <% column` is answered from the pg_trgm GIN indexes, so misspelt
+        prefixes still match without touching the full-text search path.
+        """
+        branches = []
+        for field, column in (("title", Book.book_title), ("author", Book.book_author)):
+            score = func.word_similarity(q, column)
+            branches.append(
+                select(
+                    column.label("value"),
+                    literal(field).label("field"),
+                    score.label("score"),
+                )
+                .where(literal(q).op("<%")(column))
+                .distinct()
+                .order_by(desc("score"))
+                .limit(limit)
+                .subquery()
+            )
+
+        matches = union_all(*(select(branch) for branch in branches)).subquery()
+        result = await db.execute(
+            select(matches).order_by(desc(matches.c.score), matches.c.value).limit(limit)
+        )
+        return [dict(row) for row in result.mappings().all()]
 
     @staticmethod
     async def count_books(db: AsyncSession) -> int:
         """
-        Return total number of books in the library.
+        Return total number of books in the library (trigger-maintained counter).
         """
-        result = await db.execute(select(func.count()).select_from(Book))
-        return result.scalar_one()
+        return await CounterCRUD.get(db, BOOKS)
 
     async def get_by_id(self, db: AsyncSession, book_id: int) -> Optional[Book]:
         result = await db.execute(select(Book).where(Book.book_id == book_id))
         return result.scalar_one_or_none()
 
+    async def get_version(self, db: AsyncSession, book_id: int) -> Optional[int]:
+        """Row version only; lets conditional GETs skip loading the book."""
+        result = await db.execute(select(Book.version).where(Book.book_id == book_id))
+        return result.scalar_one_or_none()
+
     async def create(self, db: AsyncSession, book_data: BookCreate) -> Book:
         new_book = Book(**book_data.dict())
         db.add(new_book)
         await db.commit()
         await db.refresh(new_book)
+        self.search_backend.index_book(new_book)
+        catalog_changed(new_book.book_id, *BOOK_LISTS)
         return new_book
 
     async def update(
@@ -76,6 +239,8 @@ class BookCRUD:
                 setattr(book, key, value)
         await db.commit()
         await db.refresh(book)
+        self.search_backend.index_book(book)
+        catalog_changed(book.book_id)
         return book
 
     async def delete(self, db: AsyncSession, book_id: int) -> bool:
@@ -84,32 +249,131 @@ class BookCRUD:
             return False
         await db.delete(book)
         await db.commit()
+        self.search_backend.remove_book(book_id)
+        catalog_changed(book_id)
         return True
 
     async def get_featured(
-        self, db: AsyncSession, skip: int = 0, limit: int = 20
+        self,
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 20,
+        fields: Optional[List[str]] = None,
     ) -> List[Book]:
         result = await db.execute(
-            select(Book).where(Book.featured == True).offset(skip).limit(limit)
+            _only(select(Book).where(Book.featured == True), fields)
+            .offset(skip)
+            .limit(limit)
         )
         return result.scalars().all()
 
     async def get_popular(
-        self, db: AsyncSession, skip: int = 0, limit: int = 20
+        self,
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 20,
+        fields: Optional[List[str]] = None,
     ) -> List[Book]:
         result = await db.execute(
-            select(Book).order_by(desc(Book.book_rating)).offset(skip).limit(limit)
+            _only(select(Book).order_by(desc(Book.book_rating)), fields)
+            .offset(skip)
+            .limit(limit)
         )
         return result.scalars().all()
 
     async def get_new(
-        self, db: AsyncSession, skip: int = 0, limit: int = 20
+        self,
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 20,
+        fields: Optional[List[str]] = None,
     ) -> List[Book]:
         result = await db.execute(
-            select(Book).order_by(desc(Book.created_at)).offset(skip).limit(limit)
+            _only(select(Book).order_by(desc(Book.created_at)), fields)
+            .offset(skip)
+            .limit(limit)
         )
         return result.scalars().all()
 
+    async def build_home_feed(self, db: AsyncSession) -> BookHomeFeed:
+        """Featured, popular and new lists for the landing page snapshot."""
+        limit = settings.HOME_FEED_SIZE
+        return BookHomeFeed.model_validate(
+            {
+                "featured": await self.get_featured(db, limit=limit),
+                "popular": await self.get_popular(db, limit=limit),
+                "new": await self.get_new(db, limit=limit),
+            },
+            from_attributes=True,
+        )
+
+    async def get_bundle(
+        self, db: AsyncSession, book_id: int, user_id: str, review_limit: int = 10
+    ) -> Optional[BookBundle]:
+        """
+        Everything the book page needs in four queries: the book, the rating
+        histogram, the newest reviews with usernames and the caller's borrow.
+        """
+        book = await self.get_by_id(db, book_id)
+        if not book:
+            return None
+
+        histogram = await db.execute(
+            select(UserRating.rating, func.count())
+            .where(UserRating.book_id == book_id)
+            .group_by(UserRating.rating)
+        )
+        counts = {float(rating): count for rating, count in histogram.all()}
+        total = sum(counts.values())
+        overall = sum(r * c for r, c in counts.items()) / total if total else 0.0
+        breakdown = {
+            star: int(counts.get(float(star), 0) / total * 100) if total else 0
+            for star in range(1, 6)
+        }
+
+        reviews = await db.execute(
+            select(
+                BookReview.review_id,
+                BookReview.user_id,
+                func.coalesce(User.user_name, "Unknown").label("username"),
+                BookReview.book_id,
+                BookReview.review_text,
+                BookReview.created_at,
+                func.count().over().label("reviews_total"),
+            )
+            .outerjoin(User, User.user_id == BookReview.user_id)
+            .where(BookReview.book_id == book_id)
+            .order_by(desc(BookReview.created_at), desc(BookReview.review_id))
+            .limit(review_limit)
+        )
+        reviews = reviews.mappings().all()
+
+        borrow = await db.execute(
+            select(BorrowRecord)
+            .where(
+                BorrowRecord.user_id == user_id,
+                BorrowRecord.book_id == book_id,
+                BorrowRecord.borrow_status.in_(ACTIVE_BORROW_STATUSES),
+            )
+            .order_by(desc(BorrowRecord.borrow_id))
+            .limit(1)
+        )
+
+        return BookBundle.model_validate(
+            {
+                "book": book,
+                "rating": {
+                    "total": total,
+                    "overall": round(overall, 1),
+                    "breakdown": breakdown,
+                },
+                "reviews": reviews,
+                "reviews_total": reviews[0]["reviews_total"] if reviews else 0,
+                "borrow": borrow.scalar_one_or_none(),
+            },
+            from_attributes=True,
+        )
+
     async def rate_book(
         self, db: AsyncSession, book_id: int, rating: float, user_id: str
     ) -> Optional[Book]:
@@ -145,6 +409,7 @@ class BookCRUD:
         book.book_rating = avg_rating
         await db.commit()
         await db.refresh(book)
+        catalog_changed(book_id, "popular")
 
         return book
 
@@ -157,4 +422,37 @@ class BookCRUD:
         book.featured = featured
         await db.commit()
         await db.refresh(book)
+        catalog_changed(book_id, "featured")
         return book
+
+
+# Landing page lists, rebuilt in the background whenever the catalog changes.
+async def _home_feed_json(db: AsyncSession) -> bytes:
+    # The snapshot holds encoded JSON so serving it costs no serialization.
+    return (await BookCRUD().build_home_feed(db)).model_dump_json().encode()
+
+
+home_feed = Snapshot("home-feed", _home_feed_json, settings.HOME_FEED_MAX_AGE_SECONDS)
+
+# Cached list responses, invalidated through "list:<name>" tags.
+BOOK_LISTS = ("featured", "popular", "new")
+
+
+def _only(query, fields: Optional[List[str]]):
+    """Load just `fields` (plus the primary key) when a projection is requested."""
+    if not fields:
+        return query
+    return query.options(load_only(*(getattr(Book, f) for f in fields)))
+
+
+def catalog_changed(book_id: Optional[int] = None, *lists: str) -> None:
+    """
+    Evict what a catalog write made stale: the book's cached responses (and
+    every cached list containing it), the named lists, facet counts and the
+    home feed.
+    """
+    tags = [f"list:{name}" for name in lists] + [FACETS_TAG]
+    if book_id is not None:
+        tags.append(book_tag(book_id))
+    response_cache.invalidate(*tags)
+    home_feed.invalidate()
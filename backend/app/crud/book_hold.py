@@ -0,0 +1,259 @@
+from typing import Dict, List
+
+from fastapi import HTTPException
+from sqlalchemy import case, func, select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.config import settings
+from app.crud.settings import SettingsCRUD
+from app.models.book import Book
+from app.models.book_hold import OPEN_HOLD_STATUSES, BookHold
+from app.models.borrow import ACTIVE_BORROW_STATUSES, BorrowRecord
+from app.models.user import User
+from app.utils.cache import copies_changed
+
+HOLD_SWEEP_LOCK = 731_002  # pg advisory lock key for expire_holds
+
+# Hand freed copies to the head of each book's queue; whatever is left over
+# goes back on the shelf. Holds turn "ready" for settings.booking_duration
+# days, or :default_duration if the settings row is missing, so a ready hold
+# always expires.
+RELEASE_COPIES = """
+    WITH freed AS (
+        SELECT * FROM unnest(CAST(:book_ids AS integer[]), CAST(:counts AS integer[]))
+            AS f(book_id, n)
+    ),
+    queue AS (
+        SELECT h.hold_id, h.book_id,
+               row_number() OVER (PARTITION BY h.book_id ORDER BY h.hold_id) AS rn
+        FROM book_holds h JOIN freed f USING (book_id)
+        WHERE h.status = 'waiting' AND h.expires_at > now()
+    ),
+    readied AS (
+        UPDATE book_holds h
+        SET status = 'ready',
+            ready_at = now(),
+            expires_at = now() + make_interval(days => coalesce(
+                (SELECT booking_duration FROM settings LIMIT 1),
+                CAST(:default_duration AS integer)
+            ))
+        FROM queue q JOIN freed f USING (book_id)
+        WHERE h.hold_id = q.hold_id AND q.rn <= f.n
+        RETURNING h.book_id
+    ),
+    shelved AS (
+        UPDATE books b
+        SET available_copies = coalesce(b.available_copies, 0) + f.n - coalesce(r.k, 0),
+            book_availabity = true
+        FROM freed f
+        LEFT JOIN (SELECT book_id, count(*) AS k FROM readied GROUP BY book_id) r
+            USING (book_id)
+        WHERE b.book_id = f.book_id AND f.n > coalesce(r.k, 0)
+        RETURNING b.book_id
+    )
+    SELECT (SELECT count(*) FROM readied) AS readied,
+           (SELECT count(*) FROM shelved) AS shelved
+"""
+
+
+async def lock_books(db: AsyncSession, book_ids: List[int]) -> None:
+    """
+    Row-lock books in id order. Every path that moves copies between the
+    shelf and the hold queue takes these locks first, so they run one at a
+    time per book. NO KEY UPDATE still lets loans referencing the book insert.
+    """
+    await db.execute(
+        select(Book.book_id)
+        .where(Book.book_id.in_(book_ids))
+        .order_by(Book.book_id)
+        .with_for_update(key_share=True)
+    )
+
+
+async def release_copies(db: AsyncSession, freed: Dict[int, int]) -> None:
+    """Return `freed` {book_id: copies} to circulation, holds first."""
+    freed = {book_id: n for book_id, n in freed.items() if n > 0}
+    if not freed:
+        return
+    book_ids = sorted(freed)
+    await lock_books(db, book_ids)
+    await db.execute(
+        text(RELEASE_COPIES),
+        {
+            "book_ids": book_ids,
+            "counts": [freed[book_id] for book_id in book_ids],
+            "default_duration": settings.DEFAULT_BOOKING_DURATION,
+        },
+    )
+
+
+def _with_position():
+    """Holds with the book title and, while waiting, the place in the queue."""
+    ahead = aliased(BookHold)
+    position = (
+        select(func.count())
+        .where(
+            ahead.book_id == BookHold.book_id,
+            ahead.status == "waiting",
+            ahead.hold_id <= BookHold.hold_id,
+        )
+        .correlate(BookHold)
+        .scalar_subquery()
+    )
+    return select(
+        BookHold.hold_id,
+        BookHold.book_id,
+        Book.book_title,
+        BookHold.status,
+        BookHold.created_at,
+        BookHold.ready_at,
+        BookHold.expires_at,
+        case((BookHold.status == "waiting", position)).label("position"),
+    ).outerjoin(Book, Book.book_id == BookHold.book_id)
+
+
+class BookHoldCRUD:
+
+    @staticmethod
+    async def place_hold(db: AsyncSession, user: User, book_id: int):
+        """
+        Join the queue for a book that has no copy on the shelf. Waiting
+        holds lapse after settings.booking_days_limit days.
+        """
+        days_limit = await SettingsCRUD.get_booking_days_limit(db)
+        if days_limit is None:
+            await db.rollback()
+            raise HTTPException(status_code=500, detail="BOOKING_LIMIT_NOT_SET")
+
+        await lock_books(db, [book_id])
+        book = (
+            await db.execute(
+                select(Book.available_copies, Book.book_availabity).where(
+                    Book.book_id == book_id
+                )
+            )
+        ).one_or_none()
+        if book is None:
+            await db.rollback()
+            raise HTTPException(status_code=404, detail="BOOK_NOT_FOUND")
+        if book.book_availabity and (book.available_copies or 0) > 0:
+            await db.rollback()
+            raise HTTPException(status_code=409, detail="BOOK_AVAILABLE")
+
+        borrowed = await db.execute(
+            select(BorrowRecord.borrow_id).where(
+                BorrowRecord.user_id == user.user_id,
+                BorrowRecord.book_id == book_id,
+                BorrowRecord.borrow_status.in_(ACTIVE_BORROW_STATUSES),
+            )
+        )
+        if borrowed.first():
+            await db.rollback()
+            raise HTTPException(status_code=409, detail="USER_ALREADY_BORROWED_THIS_BOOK")
+
+        try:
+            result = await db.execute(
+                text(
+                    "INSERT INTO book_holds (user_id, book_id, status, expires_at) "
+                    "VALUES (:user_id, :book_id, 'waiting', now() + make_interval("
+                    "days => CAST(:days AS integer))) RETURNING hold_id"
+                ),
+                {"user_id": user.user_id, "book_id": book_id, "days": days_limit},
+            )
+            hold_id = result.scalar_one()
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            raise HTTPException(status_code=409, detail="HOLD_ALREADY_EXISTS")
+
+        result = await db.execute(_with_position().where(BookHold.hold_id == hold_id))
+        return result.one()
+
+    @staticmethod
+    async def list_my_holds(db: AsyncSession, user_id: str):
+        result = await db.execute(
+            _with_position()
+            .where(
+                BookHold.user_id == user_id,
+                BookHold.status.in_(OPEN_HOLD_STATUSES),
+            )
+            .order_by(BookHold.hold_id)
+        )
+        return result.all()
+
+    @staticmethod
+    async def cancel_hold(db: AsyncSession, user: User, hold_id: int) -> None:
+        """Leave the queue; a copy set aside for the hold passes to the next in line."""
+        hold = await db.get(BookHold, hold_id)
+        if not hold or hold.user_id != user.user_id:
+            raise HTTPException(status_code=404, detail="HOLD_NOT_FOUND")
+        book_id, seen = hold.book_id, hold.status
+        if seen not in OPEN_HOLD_STATUSES:
+            raise HTTPException(status_code=409, detail="HOLD_NOT_OPEN")
+
+        await lock_books(db, [book_id])
+        cancelled = await db.execute(
+            text(
+                "UPDATE book_holds SET status = 'cancelled' "
+                "WHERE hold_id = :hold_id AND status = :seen RETURNING hold_id"
+            ),
+            {"hold_id": hold_id, "seen": seen},
+        )
+        if cancelled.scalar() is None:
+            await db.rollback()
+            raise HTTPException(status_code=409, detail="HOLD_NOT_OPEN")
+        if seen == "ready":
+            await release_copies(db, {book_id: 1})
+        await db.commit()
+        if seen == "ready":
+            copies_changed(book_id)
+
+    @staticmethod
+    async def expire_holds(db: AsyncSession) -> int:
+        """
+        Close holds past expires_at: waiting holds that outlived
+        booking_days_limit and ready holds nobody claimed within
+        booking_duration. Copies set aside for the latter pass down the
+        queue. One sweep at a time across workers (advisory lock).
+        """
+        locked = await db.execute(select(func.pg_try_advisory_xact_lock(HOLD_SWEEP_LOCK)))
+        if not locked.scalar():
+            await db.rollback()
+            return 0
+
+        due = await db.execute(
+            select(BookHold.book_id)
+            .where(
+                BookHold.status.in_(OPEN_HOLD_STATUSES),
+                BookHold.expires_at <= func.now(),
+            )
+            .distinct()
+        )
+        book_ids = sorted(due.scalars())
+        if not book_ids:
+            await db.rollback()
+            return 0
+
+        await lock_books(db, book_ids)
+        expire = (
+            "UPDATE book_holds SET status = 'expired' "
+            "WHERE status = :status AND expires_at <= now() "
+            "AND book_id = ANY(:book_ids) RETURNING book_id"
+        )
+        ready = (
+            await db.execute(text(expire), {"status": "ready", "book_ids": book_ids})
+        ).scalars().all()
+        waiting = await db.execute(
+            text(expire), {"status": "waiting", "book_ids": book_ids}
+        )
+        freed: Dict[int, int] = {}
+        for book_id in ready:
+            freed[book_id] = freed.get(book_id, 0) + 1
+        await release_copies(db, freed)
+        await db.commit()
+
+        if freed:
+            copies_changed(*freed)
+        return len(ready) + len(waiting.all())
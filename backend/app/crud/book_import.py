@@ -0,0 +1,155 @@
+import csv
+import io
+from itertools import islice
+from typing import IO, Any, Dict, Iterator, List, Tuple
+
+import orjson
+from pydantic import ValidationError
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.crud.book import BOOK_LISTS, catalog_changed
+from app.schemas.book import BookCreate, BookImportError, BookImportResult
+from app.search.backends import get_search_backend
+
+IMPORT_FORMATS = ("csv", "jsonl")
+IMPORT_CHUNK_SIZE = 5000
+MAX_REPORTED_ERRORS = 1000
+
+STAGING_TABLE = "book_import_staging"
+STAGING_COLUMNS = list(BookCreate.model_fields)
+
+# Temp table dropped at commit; mirrors BookCreate so COPY needs no casting.
+CREATE_STAGING = f"""
+    CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} (
+        line integer NOT NULL,
+        book_title varchar NOT NULL,
+        book_category varchar NOT NULL,
+        book_author varchar NOT NULL,
+        book_description text,
+        available_copies integer NOT NULL,
+        book_availabity boolean NOT NULL,
+        featured boolean NOT NULL,
+        created_at timestamp NOT NULL,
+        book_rating double precision NOT NULL,
+        book_image varchar,
+        book_audio varchar,
+        book_pdf varchar
+    ) ON COMMIT DROP
+"""
+
+# One row per (title, author); titles already in the catalog are skipped.
+MERGE_STAGING = f"""
+    INSERT INTO books ({", ".join(STAGING_COLUMNS)})
+    SELECT DISTINCT ON (s.book_title, s.book_author) {", ".join(f"s.{c}" for c in STAGING_COLUMNS)}
+    FROM {STAGING_TABLE} s
+    WHERE NOT EXISTS (
+        SELECT 1 FROM books b
+        WHERE b.book_title = s.book_title AND b.book_author = s.book_author
+    )
+    ORDER BY s.book_title, s.book_author, s.line
+"""
+
+
+def read_rows(stream: IO[bytes], fmt: str) -> Iterator[Tuple[int, Any]]:
+    """Yield (line number, raw row) lazily from a CSV or JSONL byte stream."""
+    if fmt == "jsonl":
+        for line_no, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_no, orjson.loads(line)
+            except orjson.JSONDecodeError as e:
+                yield line_no, e
+        return
+
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8-sig", newline=""))
+    for row in reader:
+        # Empty CSV cells mean "not provided", not an empty string.
+        yield reader.line_num, {k: v for k, v in row.items() if k and v != ""}
+
+
+def validate_chunk(
+    rows: List[Tuple[int, Any]],
+) -> Tuple[List[tuple], List[BookImportError]]:
+    records, errors = [], []
+    for line, raw in rows:
+        if isinstance(raw, Exception):
+            errors.append(BookImportError(line=line, errors=[{"msg": str(raw)}]))
+            continue
+        try:
+            book = BookCreate.model_validate(raw)
+        except ValidationError as e:
+            errors.append(
+                BookImportError(
+                    line=line,
+                    errors=[
+                        {"loc": ".".join(map(str, err["loc"])), "msg": err["msg"]}
+                        for err in e.errors()
+                    ],
+                )
+            )
+            continue
+        values = book.model_dump()
+        records.append((line, *(values[c] for c in STAGING_COLUMNS)))
+    return records, errors
+
+
+def next_chunk(
+    rows: Iterator[Tuple[int, Any]],
+) -> Tuple[int, List[tuple], List[BookImportError]]:
+    """Read and validate the next chunk: (rows read, records, errors)."""
+    chunk = list(islice(rows, IMPORT_CHUNK_SIZE))
+    return (len(chunk), *validate_chunk(chunk))
+
+
+class BookImportCRUD:
+
+    @staticmethod
+    async def import_books(
+        db: AsyncSession, stream: IO[bytes], fmt: str
+    ) -> BookImportResult:
+        """
+        Stream `stream` into the catalog: rows are read and validated against
+        BookCreate a chunk at a time in a worker thread and COPYed into a temp
+        staging table, then merged into books, so memory stays flat whatever
+        the file size and other requests keep being served meanwhile.
+        Runs in one transaction; invalid rows are reported, not fatal.
+        """
+        conn = await db.connection()
+        raw = await conn.get_raw_connection()
+        driver = raw.driver_connection  # asyncpg, for binary COPY
+        await conn.execute(text(CREATE_STAGING))
+
+        result: Dict[str, Any] = {"total_rows": 0, "imported": 0, "failed": 0, "errors": []}
+        rows = read_rows(stream, fmt)
+        while True:
+            # Reading and validating is blocking CPU work: keep it off the event loop.
+            read, records, errors = await run_in_threadpool(next_chunk, rows)
+            if not read:
+                break
+            result["total_rows"] += read
+            result["failed"] += len(errors)
+            room = MAX_REPORTED_ERRORS - len(result["errors"])
+            result["errors"].extend(errors[:room])
+            if not records:
+                continue
+            await driver.copy_records_to_table(
+                STAGING_TABLE, records=records, columns=["line", *STAGING_COLUMNS]
+            )
+
+        # A single set-based merge: one anti-join against books, not one per chunk.
+        merged = await conn.execute(text(MERGE_STAGING))
+        result["imported"] = merged.rowcount
+        await db.commit()
+        result["skipped_duplicates"] = (
+            result["total_rows"] - result["failed"] - result["imported"]
+        )
+
+        if result["imported"]:
+            search_backend = get_search_backend()
+            if search_backend.in_memory:
+                await search_backend.rebuild(db)
+            catalog_changed(None, *BOOK_LISTS)
+        return BookImportResult(**result)
@@ -1,17 +1,203 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import NoResultFound
-from app.models.borrow import BorrowRecord
+from app.models.borrow import (
+    ACTIVE_BORROW_STATUSES,
+    BORROW_STATUSES,
+    CLOSED_BORROW_STATUSES,
+    BorrowRecord,
+    BorrowRecordArchive,
+)
 from app.models.book import Book
+from app.models.book_hold import BookHold
 from app.models.user import User
-from app.schemas.borrow import BorrowCreate, BorrowStatusUpdate, BorrowDetailResponse
+from app.schemas.borrow import (
+    BorrowBulkItemResult,
+    BorrowBulkStatusResult,
+    BorrowCreate,
+    BorrowDetailResponse,
+    BorrowStatusChange,
+    BorrowStatusUpdate,
+    BorrowSummary,
+    LoanStatus,
+)
 from fastapi import HTTPException, status
 from datetime import date, timedelta, datetime
+from app.crud.book_hold import lock_books, release_copies
+from app.crud.counter import CounterCRUD, borrow_status_counter
 from app.crud.settings import SettingsCRUD
-from sqlalchemy import func
+from app.utils.cache import (
+    ALL_BORROWS_TAG, borrower_tag, copies_changed, summary_cache,
+)
+from collections import defaultdict
+from sqlalchemy import (
+    Integer, String, and_, case, column, func, or_, text, tuple_, union_all, update,
+    values,
+)
+from sqlalchemy.orm import aliased
+from sqlalchemy.exc import IntegrityError
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, date
 
 
+def _loans(include_archived: bool = False):
+    """
+    BorrowRecord, or with `include_archived` an alias of it over the hot
+    rows UNION ALL borrow_records_archive, usable wherever BorrowRecord is.
+    """
+    if not include_archived:
+        return BorrowRecord
+    columns = [c.name for c in BorrowRecord.__table__.columns]
+    archive = BorrowRecordArchive.__table__
+    union = union_all(
+        select(*(BorrowRecord.__table__.c[name] for name in columns)),
+        select(*(archive.c[name] for name in columns)),
+    ).subquery("loans")
+    return aliased(BorrowRecord, union)
+
+
+def _with_details(loans=BorrowRecord):
+    """
+    Borrow rows with the borrower's name/email and the book title joined in,
+    one query for the whole list (columns match BorrowRequestRecord and
+    BorrowDetailResponse). `loans` is BorrowRecord or a `_loans` alias.
+    """
+    return (
+        select(
+            loans.borrow_id,
+            loans.user_id,
+            loans.book_id,
+            loans.borrow_date,
+            loans.return_date,
+            loans.returned_at,
+            loans.borrow_status,
+            User.user_name,
+            User.user_email,
+            Book.book_title,
+        )
+        .outerjoin(User, User.user_id == loans.user_id)
+        .outerjoin(Book, Book.book_id == loans.book_id)
+        .order_by(loans.borrow_id)
+    )
+
+
+# Claim one of the user's loan slots. The row lock it takes also serialises
+# a user's concurrent checkouts, so the "already has this book" check in
+# CHECKOUT below cannot race.
+CLAIM_SLOT = """
+    UPDATE users SET active_borrow_count = active_borrow_count + 1
+    WHERE user_id = :user_id AND active_borrow_count < :max_active
+    RETURNING active_borrow_count
+"""
+
+# Take a copy and record the loan in one statement. The UPDATE only matches
+# while a copy is left (row lock + recheck under concurrency) and the user
+# doesn't already hold the book; the INSERT runs only if the UPDATE returned
+# the book. The trailing SELECT reports why nothing was inserted: a missing
+# book, one the user already holds, or else no copy left.
+CHECKOUT = """
+    WITH held AS (
+        SELECT EXISTS (
+            SELECT 1 FROM borrow_records
+            WHERE user_id = :user_id AND book_id = :book_id
+              AND borrow_status = ANY(:active)
+        ) AS has_book
+    ),
+    taken AS (
+        UPDATE books
+        SET available_copies = available_copies - 1,
+            book_availabity = available_copies - 1 > 0
+        WHERE book_id = :book_id
+          AND book_availabity
+          AND coalesce(available_copies, 0) > 0
+          AND NOT (SELECT has_book FROM held)
+        RETURNING book_id
+    ),
+    loan AS (
+        INSERT INTO borrow_records (user_id, book_id, borrow_date, return_date, borrow_status)
+        SELECT :user_id, book_id, :borrow_date, :return_date, 'pending' FROM taken
+        RETURNING borrow_id, user_id, book_id, borrow_date, return_date, borrow_status
+    )
+    SELECT loan.*, held.has_book,
+           EXISTS (SELECT 1 FROM books WHERE book_id = :book_id) AS book_exists
+    FROM held LEFT JOIN loan ON true
+"""
+
+
+def _transition(old: Optional[str], new: str) -> Optional[Tuple[int, bool]]:
+    """
+    Side effects of moving a loan from `old` to `new` status:
+    (change to the user's active_borrow_count, whether a copy goes back).
+    None if the move isn't allowed: a closed loan has already given its
+    slot and copy back, so it can't be made active again. Raises ValueError
+    for a status outside BORROW_STATUSES rather than guessing its effect.
+    """
+    for name in (old, new):
+        if name not in BORROW_STATUSES:
+            raise ValueError(f"Unknown borrow status: {name!r}")
+    was_active = old in ACTIVE_BORROW_STATUSES
+    is_active = new in ACTIVE_BORROW_STATUSES
+    if was_active and not is_active:
+        return -1, new in ("returned", "rejected")
+    if is_active and not was_active:
+        return None
+    return 0, False
+
+
+async def _lock_parties(db: AsyncSession, user_ids, book_ids) -> None:
+    """
+    Row-lock the borrowers, then the books, in id order: the order checkout
+    takes them in (CLAIM_SLOT, then CHECKOUT). Status changes take these
+    before locking the loans themselves so they can't deadlock with it.
+    """
+    await db.execute(
+        select(User.user_id)
+        .where(User.user_id.in_(user_ids))
+        .order_by(User.user_id)
+        .with_for_update(key_share=True)
+    )
+    await lock_books(db, sorted(book_ids))
+
+
+def _borrows_changed(*user_ids: str) -> None:
+    """Drop this worker's cached summaries made stale by a loan write."""
+    summary_cache.invalidate(ALL_BORROWS_TAG, *(borrower_tag(u) for u in user_ids))
+
+
+def _release_slot(user_id: str):
+    """Give back one of the user's loan slots (a loan left the active set)."""
+    return (
+        update(User)
+        .where(User.user_id == user_id)
+        .values(active_borrow_count=func.greatest(User.active_borrow_count - 1, 0))
+    )
+
+
+# Open loans that turn overdue once their return date has passed.
+OVERDUE_CANDIDATE_STATUSES = ("pending", "accepted")
+OVERDUE_SWEEP_LOCK = 731_001  # pg advisory lock key for mark_overdue
+
+
+LEDGER_SORTS = ("borrow_id", "borrow_date", "return_date")
+
+
+def _after(column, id_column, descending: bool, value, last_id: int):
+    """Keyset predicate for rows after (value, last_id) in the ledger order."""
+    if descending:  # NULLs first, then values high to low
+        if value is None:
+            return or_(
+                and_(column.is_(None), id_column < last_id),
+                column.is_not(None),
+            )
+        return tuple_(column, id_column) < tuple_(value, last_id)
+    if value is None:  # values low to high, then NULLs
+        return and_(column.is_(None), id_column > last_id)
+    return or_(
+        tuple_(column, id_column) > tuple_(value, last_id),
+        column.is_(None),
+    )
+
+
 class BorrowCRUD:
 
     @staticmethod
@@ -31,14 +217,9 @@ class BorrowCRUD:
     @staticmethod
     async def count_by_borrow_status(db: AsyncSession, status: str) -> int:
         """
-        Count number of borrows by borrow_status.
+        Count number of borrows by borrow_status (trigger-maintained counter).
         """
-        result = await db.execute(
-            select(func.count())
-            .select_from(BorrowRecord)
-            .where(BorrowRecord.borrow_status == status)
-        )
-        return result.scalar_one()
+        return await CounterCRUD.get(db, borrow_status_counter(status))
 
     @staticmethod
     async def create_pdf_borrow(db: AsyncSession, user: User, book_id: int):
@@ -74,53 +255,24 @@ class BorrowCRUD:
         db.add(db_borrow)
         await db.commit()
         await db.refresh(db_borrow)
+        _borrows_changed(db_borrow.user_id)
         return db_borrow
 
     @staticmethod
     async def create_borrow(db: AsyncSession, borrow: "BorrowCreate", user: User):
-        book = await db.get(Book, borrow.book_id)
-        if not book:
-            raise HTTPException(status_code=404, detail="BOOK_NOT_FOUND")
-
-        if not book.book_availabity or (
-            book.available_copies is not None and book.available_copies < 1
-        ):
-            raise HTTPException(status_code=409, detail="BOOK_UNAVAILABLE")
-
-        borrow_day_limit = await SettingsCRUD.get_borrow_day_limit(db)
-        if borrow_day_limit is None:
+        """
+        Check out a book in one transaction: claim a loan slot on the user row
+        (a single-row conditional UPDATE against users.active_borrow_count),
+        then one CHECKOUT statement that takes a copy and inserts the loan.
+        If either step matches nothing the transaction is rolled back, so the
+        slot and the copy are only ever taken together. Concurrent checkouts
+        can't oversell the last copy or exceed the user's limit; the partial
+        unique index rejects a second active loan of the same book.
+        """
+        limits = await SettingsCRUD.get_borrow_limits(db)
+        if limits is None:
             raise HTTPException(status_code=500, detail="BORROW_LIMIT_NOT_SET")
-
-        borrow_max_limit = await SettingsCRUD.get_borrow_max_limit(db)
-
-        existing_borrow = await db.execute(
-            select(BorrowRecord)
-            .where(BorrowRecord.user_id == user.user_id)
-            .where(BorrowRecord.book_id == borrow.book_id)
-            .where(BorrowRecord.borrow_status != "returned")
-            .where(BorrowRecord.borrow_status != "rejected")
-            .where(BorrowRecord.borrow_status != "pdf-viewed")
-        )
-        existing_borrow = existing_borrow.scalars().first()
-        if existing_borrow:
-            raise HTTPException(
-                status_code=409, detail="USER_ALREADY_BORROWED_THIS_BOOK"
-            )
-
-        total_active_borrows = await db.execute(
-            select(func.count())
-            .select_from(BorrowRecord)
-            .where(BorrowRecord.user_id == user.user_id)
-            .where(BorrowRecord.borrow_status != "returned")
-            .where(BorrowRecord.borrow_status != "rejected")
-            .where(BorrowRecord.borrow_status != "pdf-viewed")
-        )
-        total_active_borrows = total_active_borrows.scalar() or 0
-        if total_active_borrows >= borrow_max_limit:
-            raise HTTPException(
-                status_code=409,
-                detail=f"USER_CANNOT_BORROW_MORE_THAN_{borrow_max_limit}_BOOKS",
-            )
+        borrow_day_limit, borrow_max_limit = limits
 
         borrow_date = date.today()
         return_date = borrow_date + timedelta(days=borrow_day_limit)
@@ -145,24 +297,107 @@ class BorrowCRUD:
                 )
             return_date = requested_return_date
 
+        slot = await db.execute(
+            text(CLAIM_SLOT),
+            {"user_id": user.user_id, "max_active": borrow_max_limit},
+        )
+        if slot.scalar() is None:
+            await db.rollback()
+            raise HTTPException(
+                status_code=409,
+                detail=f"USER_CANNOT_BORROW_MORE_THAN_{borrow_max_limit}_BOOKS",
+            )
+
+        try:
+            result = await db.execute(
+                text(CHECKOUT),
+                {
+                    "user_id": user.user_id,
+                    "book_id": borrow.book_id,
+                    "borrow_date": borrow_date,
+                    "return_date": return_date,
+                    "active": list(ACTIVE_BORROW_STATUSES),
+                },
+            )
+            outcome = result.one()
+        except IntegrityError:
+            # Backstop for the partial unique index; the slot lock makes this rare.
+            await db.rollback()
+            raise HTTPException(status_code=409, detail="USER_ALREADY_BORROWED_THIS_BOOK")
+
+        if outcome.borrow_id is None:
+            await db.rollback()  # hand the slot back
+            if not outcome.book_exists:
+                raise HTTPException(status_code=404, detail="BOOK_NOT_FOUND")
+            if outcome.has_book:
+                raise HTTPException(
+                    status_code=409, detail="USER_ALREADY_BORROWED_THIS_BOOK"
+                )
+            raise HTTPException(status_code=409, detail="BOOK_UNAVAILABLE")
+        await db.commit()
+
+        copies_changed(borrow.book_id)
+        _borrows_changed(outcome.user_id)
+        return outcome
+
+    @staticmethod
+    async def claim_hold(db: AsyncSession, user: User, hold_id: int):
+        """
+        Turn a ready hold into a pending loan. The copy was already set aside
+        when it was returned, so only the user's loan slot is taken here.
+        """
+        user_id = user.user_id  # `user` is expired by a rollback below
+        limits = await SettingsCRUD.get_borrow_limits(db)
+        if limits is None:
+            raise HTTPException(status_code=500, detail="BORROW_LIMIT_NOT_SET")
+        borrow_day_limit, borrow_max_limit = limits
+
+        slot = await db.execute(
+            text(CLAIM_SLOT),
+            {"user_id": user_id, "max_active": borrow_max_limit},
+        )
+        if slot.scalar() is None:
+            await db.rollback()
+            raise HTTPException(
+                status_code=409,
+                detail=f"USER_CANNOT_BORROW_MORE_THAN_{borrow_max_limit}_BOOKS",
+            )
+
+        claimed = await db.execute(
+            update(BookHold)
+            .where(
+                BookHold.hold_id == hold_id,
+                BookHold.user_id == user_id,
+                BookHold.status == "ready",
+                BookHold.expires_at > func.now(),
+            )
+            .values(status="claimed")
+            .returning(BookHold.book_id)
+        )
+        book_id = claimed.scalar()
+        if book_id is None:
+            await db.rollback()
+            hold = await db.get(BookHold, hold_id)
+            if not hold or hold.user_id != user_id:
+                raise HTTPException(status_code=404, detail="HOLD_NOT_FOUND")
+            raise HTTPException(status_code=409, detail="HOLD_NOT_READY")
+
+        borrow_date = date.today()
         db_borrow = BorrowRecord(
-            user_id=user.user_id,
-            book_id=book.book_id,
+            user_id=user_id,
+            book_id=book_id,
             borrow_date=borrow_date,
-            return_date=return_date,
+            return_date=borrow_date + timedelta(days=borrow_day_limit),
             borrow_status="pending",
         )
-
         db.add(db_borrow)
-
-        if book.available_copies is not None and book.available_copies > 0:
-            book.available_copies -= 1
-        book.book_availabity = book.available_copies > 0
-        db.add(book)
-
-        await db.commit()
+        try:
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            raise HTTPException(status_code=409, detail="USER_ALREADY_BORROWED_THIS_BOOK")
         await db.refresh(db_borrow)
-
+        _borrows_changed(user_id)
         return db_borrow
 
     @staticmethod
@@ -171,163 +406,233 @@ class BorrowCRUD:
         Get detailed list of borrows filtered by borrow_status.
         """
         result = await db.execute(
-            select(BorrowRecord).where(BorrowRecord.borrow_status == status)
+            _with_details().where(BorrowRecord.borrow_status == status)
         )
-        borrows = result.scalars().all()
-
-        for borrow in borrows:
-            book = await db.get(Book, borrow.book_id)
-            borrow.book_title = book.book_title if book else None
-
-            user = await db.get(User, borrow.user_id)
-            borrow.user_email = user.user_email
-            borrow.user_name = user.user_name if user else None
-            borrow.user_email = user.user_email if user else None
-
-        return borrows
+        return result.all()
 
     @staticmethod
     async def list_by_request_status(db: AsyncSession, status: str):
         """
-        Get detailed list of borrows filtered by request_status.
+        Get detailed list of borrows filtered by request status. The request
+        status lives in borrow_status (pending / accepted / rejected).
         """
-        result = await db.execute(
-            select(BorrowRecord).where(BorrowRecord.request_status == status)
-        )
-        borrows = result.scalars().all()
-
-        for borrow in borrows:
-            book = await db.get(Book, borrow.book_id)
-            borrow.book_title = book.book_title if book else None
-
-            user = await db.get(User, borrow.user_id)
-            borrow.user_name = user.user_name if user else None
-
-        return borrows
+        return await BorrowCRUD.list_by_borrow_status(db, status)
 
     @staticmethod
     async def get_all_borrows_admin(db: AsyncSession):
         """
         Admin: Get all borrow records for all users with book & user details.
         """
-        result = await db.execute(select(BorrowRecord))
-        borrows = result.scalars().all()
-
-        for borrow in borrows:
-            book = await db.get(Book, borrow.book_id)
-            borrow.book_title = book.book_title if book else None
+        result = await db.execute(_with_details())
+        return result.all()
 
-            user = await db.get(User, borrow.user_id)
-            borrow.user_name = user.user_name if user else None
+    @staticmethod
+    async def get_ledger(
+        db: AsyncSession,
+        statuses: Optional[List[str]] = None,
+        user_id: Optional[str] = None,
+        book_id: Optional[int] = None,
+        borrowed_from: Optional[date] = None,
+        borrowed_to: Optional[date] = None,
+        due_from: Optional[date] = None,
+        due_to: Optional[date] = None,
+        sort: str = "-borrow_id",
+        after: Optional[list] = None,
+        limit: int = 50,
+        include_archived: bool = False,
+    ) -> Tuple[list, bool]:
+        """
+        Admin circulation ledger: filtered borrow rows in keyset pages.
+        `sort` is a LEDGER_SORTS key; `after` is the (sort value, borrow_id)
+        of the last row served. Returns the page and whether more follow.
+        With `include_archived` archived loans are paged in as well.
+        """
+        loans = _loans(include_archived)
+        query = _with_details(loans).order_by(None)
+        if statuses:
+            query = query.where(loans.borrow_status.in_(statuses))
+        if user_id:
+            query = query.where(loans.user_id == user_id)
+        if book_id:
+            query = query.where(loans.book_id == book_id)
+        if borrowed_from:
+            query = query.where(loans.borrow_date >= borrowed_from)
+        if borrowed_to:
+            query = query.where(loans.borrow_date <= borrowed_to)
+        if due_from:
+            query = query.where(loans.return_date >= due_from)
+        if due_to:
+            query = query.where(loans.return_date <= due_to)
+
+        descending = sort.startswith("-")
+        name = sort.lstrip("-")
+        column = getattr(loans, name)
+        if name == "borrow_id":
+            if after is not None:
+                last_id = after[1]
+                query = query.where(
+                    loans.borrow_id < last_id if descending else loans.borrow_id > last_id
+                )
+            order = [loans.borrow_id.desc() if descending else loans.borrow_id]
+        else:
+            if after is not None:
+                query = query.where(_after(column, loans.borrow_id, descending, *after))
+            # NULLS FIRST descending / LAST ascending: both walk the same btree.
+            order = (
+                [column.desc().nulls_first(), loans.borrow_id.desc()]
+                if descending
+                else [column.asc().nulls_last(), loans.borrow_id]
+            )
 
-        return borrows
+        result = await db.execute(query.order_by(*order).limit(limit + 1))
+        rows = result.all()
+        return rows[:limit], len(rows) > limit
 
     @staticmethod
-    async def get_my_borrow(db: AsyncSession, user_id: str):
+    async def get_my_borrow(
+        db: AsyncSession, user_id: str, include_archived: bool = False
+    ):
         """
         Get all borrow records for a specific user with book/user details.
         """
+        loans = _loans(include_archived)
         result = await db.execute(
-            select(BorrowRecord).where(BorrowRecord.user_id == user_id)
+            _with_details(loans).where(loans.user_id == user_id)
         )
-        borrows = result.scalars().all()
-
-        for borrow in borrows:
-            book = await db.get(Book, borrow.book_id)
-            borrow.book_title = book.book_title if book else None
-
-            user = await db.get(User, borrow.user_id)
-            borrow.user_name = user.user_name if user else None
-
-        return borrows
+        return result.all()
 
     @staticmethod
     async def count_my_borrow_status(
         db: AsyncSession, user_id: str, status: str
     ) -> int:
-
-        now = datetime.utcnow().date()
-
-        result = await db.execute(
-            select(BorrowRecord).where(
-                BorrowRecord.user_id == user_id,
-                BorrowRecord.borrow_status != "returned",
-            )
-        )
-        user_borrows = result.scalars().all()
-
-        updated = False
-        for borrow in user_borrows:
-            if (
-                borrow.return_date
-                and borrow.return_date < now
-                and borrow.borrow_status != "overdue"
-            ):
-                borrow.borrow_status = "overdue"
-                db.add(borrow)
-                updated = True
-
-        if updated:
-            await db.commit()
-
+        """Pure read: overdue flags are kept current by mark_overdue."""
+        loans = _loans(include_archived=status in CLOSED_BORROW_STATUSES)
         result = await db.execute(
             select(func.count())
-            .select_from(BorrowRecord)
-            .where(
-                BorrowRecord.user_id == user_id, BorrowRecord.borrow_status == status
-            )
+            .select_from(loans)
+            .where(loans.user_id == user_id, loans.borrow_status == status)
         )
         return result.scalar_one()
 
-        if updated:
-            await db.commit()
+    @staticmethod
+    async def get_summary(db: AsyncSession, user_id: Optional[str] = None) -> BorrowSummary:
+        """
+        Loan counts for every status, archived loans included: the caller's
+        from one GROUP BY over their rows, or library-wide (user_id None)
+        from the trigger-kept counters. Cached for BORROW_SUMMARY_TTL_SECONDS.
+        """
+        key = ("borrow-summary", user_id)
+        cached = summary_cache.get(key)
+        if cached is not None:
+            return cached
+
+        if user_id is None:
+            names = {borrow_status_counter(s): s for s in BORROW_STATUSES}
+            values = await CounterCRUD.get_many(db, names)
+            counts = {names[name]: value for name, value in values.items()}
+        else:
+            loans = _loans(include_archived=True)
+            result = await db.execute(
+                select(loans.borrow_status, func.count())
+                .where(loans.user_id == user_id)
+                .group_by(loans.borrow_status)
+            )
+            counts = dict.fromkeys(BORROW_STATUSES, 0)
+            counts.update(
+                (status, n) for status, n in result.all() if status is not None
+            )
+
+        summary = BorrowSummary(
+            scope="all" if user_id is None else "user",
+            counts=counts,
+            active=sum(counts.get(s, 0) for s in ACTIVE_BORROW_STATUSES),
+            total=sum(counts.values()),
+        )
+        summary_cache.set(
+            key, summary, tags=[ALL_BORROWS_TAG if user_id is None else borrower_tag(user_id)]
+        )
+        return summary
 
+    @staticmethod
+    async def mark_overdue(db: AsyncSession) -> int:
+        """
+        Flag every open loan past its return date as overdue in one UPDATE.
+        Safe to run from every worker: a transaction-scoped advisory lock lets
+        one sweep run at a time and the others return 0 immediately.
+        """
+        locked = await db.execute(
+            select(func.pg_try_advisory_xact_lock(OVERDUE_SWEEP_LOCK))
+        )
+        if not locked.scalar():
+            await db.rollback()
+            return 0
         result = await db.execute(
-            select(func.count())
-            .select_from(BorrowRecord)
+            update(BorrowRecord)
             .where(
-                BorrowRecord.user_id == user_id, BorrowRecord.borrow_status == status
+                BorrowRecord.borrow_status.in_(OVERDUE_CANDIDATE_STATUSES),
+                BorrowRecord.return_date < func.current_date(),
             )
+            .values(borrow_status="overdue")
+            .execution_options(synchronize_session=False)
         )
-        return result.scalar_one()
+        await db.commit()
+        if result.rowcount:
+            summary_cache.clear()
+        return result.rowcount
 
     @staticmethod
     async def count_by_request_status(db: AsyncSession, status: str) -> int:
         """
-        Count number of borrows by request_status.
+        Count number of borrows by request status, i.e. borrow_status
+        (trigger-maintained counter).
         """
-        result = await db.execute(
-            select(func.count())
-            .select_from(BorrowRecord)
-            .where(BorrowRecord.request_status == status)
-        )
-        return result.scalar_one()
+        return await BorrowCRUD.count_by_borrow_status(db, status)
 
     @staticmethod
-    async def update_borrow_status(db: AsyncSession, borrow_id: int, status: str):
-        db_borrow = await db.get(BorrowRecord, borrow_id)
+    async def update_borrow_status(db: AsyncSession, borrow_id: int, status: LoanStatus):
+        # A loan's user and book never change, so they can be read unlocked
+        # and locked ahead of the loan row, in checkout's order.
+        parties = (
+            await db.execute(
+                select(BorrowRecord.user_id, BorrowRecord.book_id).where(
+                    BorrowRecord.borrow_id == borrow_id
+                )
+            )
+        ).one_or_none()
+        if parties is None:
+            raise HTTPException(status_code=404, detail="BORROW_NOT_FOUND")
+        await _lock_parties(db, [parties.user_id], [parties.book_id])
+
+        # Row lock: two admins closing the same loan can't both hand back a copy.
+        db_borrow = await db.get(
+            BorrowRecord, borrow_id, with_for_update=True, populate_existing=True
+        )
         if not db_borrow:
+            await db.rollback()
             raise HTTPException(status_code=404, detail="BORROW_NOT_FOUND")
 
-        db_borrow.borrow_status = status
+        change = _transition(db_borrow.borrow_status, status)
+        if change is None:
+            await db.rollback()
+            raise HTTPException(status_code=409, detail="BORROW_ALREADY_CLOSED")
+        slot_delta, restock = change
+
+        if slot_delta < 0:
+            await db.execute(_release_slot(db_borrow.user_id))
+        if restock:
+            # The copy goes to the next hold in line, else back on the shelf.
+            await release_copies(db, {db_borrow.book_id: 1})
 
+        db_borrow.borrow_status = status
         if status == "returned":
             db_borrow.returned_at = datetime.utcnow().date()  # set today's date
 
-            book = await db.get(Book, db_borrow.book_id)
-            if book:
-                book.available_copies = (book.available_copies or 0) + 1
-                db.add(book)
-
-        if status == "rejected":
-            book = await db.get(Book, db_borrow.book_id)
-            if book:
-                book.book_availabity = True
-                book.available_copies = (book.available_copies or 0) + 1
-                db.add(book)
         db.add(db_borrow)
         await db.commit()
         await db.refresh(db_borrow)
+        if restock:
+            copies_changed(db_borrow.book_id)
+        _borrows_changed(db_borrow.user_id)
 
         user = await db.get(User, db_borrow.user_id)
         book = await db.get(Book, db_borrow.book_id)
@@ -346,6 +651,118 @@ class BorrowCRUD:
             ),
         )
 
+    @staticmethod
+    async def bulk_update_status(
+        db: AsyncSession, changes: List[BorrowStatusChange]
+    ) -> BorrowBulkStatusResult:
+        """
+        Apply many (borrow_id, status) changes in one transaction: lock the
+        borrowers, books and loans (in checkout's order), then one UPDATE ...
+        FROM (VALUES ...) each for the users' loan slots and the loans
+        themselves, and one release_copies call for all the returned copies.
+        Unknown or repeated ids and closed loans that would be reopened are
+        reported per item and don't block the rest.
+        """
+        ids = [change.borrow_id for change in changes]
+        parties = (
+            await db.execute(
+                select(BorrowRecord.user_id, BorrowRecord.book_id).where(
+                    BorrowRecord.borrow_id.in_(ids)
+                )
+            )
+        ).all()
+        await _lock_parties(
+            db, {row.user_id for row in parties}, {row.book_id for row in parties}
+        )
+        locked = await db.execute(
+            select(BorrowRecord.borrow_id, BorrowRecord.user_id,
+                   BorrowRecord.book_id, BorrowRecord.borrow_status)
+            .where(BorrowRecord.borrow_id.in_(ids))
+            .order_by(BorrowRecord.borrow_id)
+            .with_for_update()
+        )
+        loans = {row.borrow_id: row for row in locked}
+
+        results, applied, seen = [], [], set()
+        slot_deltas: Dict[str, int] = defaultdict(int)
+        restocks: Dict[int, int] = defaultdict(int)
+        for change in changes:
+            loan = loans.get(change.borrow_id)
+            if loan is None or change.borrow_id in seen:
+                results.append(
+                    BorrowBulkItemResult(
+                        borrow_id=change.borrow_id,
+                        ok=False,
+                        detail="BORROW_NOT_FOUND" if loan is None else "DUPLICATE_BORROW_ID",
+                    )
+                )
+                continue
+            seen.add(change.borrow_id)
+            transition = _transition(loan.borrow_status, change.status)
+            if transition is None:
+                results.append(
+                    BorrowBulkItemResult(
+                        borrow_id=change.borrow_id,
+                        ok=False,
+                        previous_status=loan.borrow_status,
+                        detail="BORROW_ALREADY_CLOSED",
+                    )
+                )
+                continue
+            slot_delta, restock = transition
+            slot_deltas[loan.user_id] += slot_delta
+            restocks[loan.book_id] += restock
+            applied.append((change.borrow_id, change.status))
+            results.append(
+                BorrowBulkItemResult(
+                    borrow_id=change.borrow_id,
+                    ok=True,
+                    previous_status=loan.borrow_status,
+                    borrow_status=change.status,
+                )
+            )
+
+        slots = [(user_id, n) for user_id, n in sorted(slot_deltas.items()) if n]
+        if slots:
+            v = values(
+                column("user_id", String), column("delta", Integer), name="v"
+            ).data(slots)
+            await db.execute(
+                update(User)
+                .where(User.user_id == v.c.user_id)
+                .values(
+                    active_borrow_count=func.greatest(
+                        User.active_borrow_count + v.c.delta, 0
+                    )
+                )
+            )
+        books = [book_id for book_id, n in restocks.items() if n]
+        await release_copies(db, restocks)
+        if applied:
+            v = values(
+                column("borrow_id", Integer), column("status", String), name="v"
+            ).data(applied)
+            await db.execute(
+                update(BorrowRecord)
+                .where(BorrowRecord.borrow_id == v.c.borrow_id)
+                .values(
+                    borrow_status=v.c.status,
+                    returned_at=case(
+                        (v.c.status == "returned", datetime.utcnow().date()),
+                        else_=BorrowRecord.returned_at,
+                    ),
+                )
+                .execution_options(synchronize_session=False)
+            )
+        await db.commit()
+
+        if books:
+            copies_changed(*books)
+        _borrows_changed(*{loans[borrow_id].user_id for borrow_id, _ in applied})
+        return BorrowBulkStatusResult(
+            updated=len(applied), failed=len(results) - len(applied), results=results
+        )
+
     @staticmethod
     async def update_borrow_request_status(
         db: AsyncSession, borrow_id: int, status: str
@@ -385,71 +802,42 @@ class BorrowCRUD:
 
     @staticmethod
     async def delete_borrow(db: AsyncSession, db_borrow: BorrowRecord):
-        if db_borrow.borrow_status == "borrowed":
-            book = await db.get(Book, db_borrow.book_id)
-            if book:
-                book.book_availability = True
-                db.add(book)
+        # An active loan still holds a slot and a copy: give both back.
+        active = db_borrow.borrow_status in ACTIVE_BORROW_STATUSES
+        user_id, book_id = db_borrow.user_id, db_borrow.book_id
+        if active:
+            await db.execute(_release_slot(user_id))
+            await release_copies(db, {book_id: 1})
 
         await db.delete(db_borrow)
         await db.commit()
+        if active:
+            copies_changed(book_id)
+        _borrows_changed(user_id)
         return True
 
     @staticmethod
     async def list_my_borrow_status(db: AsyncSession, status: str, user_id: str = None):
 
-        query = select(BorrowRecord).where(BorrowRecord.borrow_status == status)
+        query = _with_details().where(BorrowRecord.borrow_status == status)
 
         if user_id:
             query = query.where(BorrowRecord.user_id == user_id)
 
         result = await db.execute(query)
-        borrows = result.scalars().all()
-
-        for borrow in borrows:
-            book = await db.get(Book, borrow.book_id)
-            borrow.book_title = book.book_title if book else None
-
-            user = await db.get(User, borrow.user_id)
-            borrow.user_name = user.user_name if user else None
-
-        return borrows
+        return result.all()
 
     @staticmethod
     async def count_my_request_status(
         db: AsyncSession, status: str, user_id: str = None
     ) -> int:
-
-        query = (
-            select(func.count())
-            .select_from(BorrowRecord)
-            .where(BorrowRecord.request_status == status)
-        )
-
-        if user_id:
-            query = query.where(BorrowRecord.user_id == user_id)
-
-        result = await db.execute(query)
-        return result.scalar_one()
+        """The user's loans in request status (borrow_status) `status`; all with no user."""
+        if not user_id:
+            return await BorrowCRUD.count_by_request_status(db, status)
+        return await BorrowCRUD.count_my_borrow_status(db, user_id=user_id, status=status)
 
     @staticmethod
     async def list_my_request_status(
         db: AsyncSession, status: str, user_id: str = None
     ):
-
-        query = select(BorrowRecord).where(BorrowRecord.request_status == status)
-
-        if user_id:
-            query = query.where(BorrowRecord.user_id == user_id)
-
-        result = await db.execute(query)
-        borrows = result.scalars().all()
-
-        for borrow in borrows:
-            book = await db.get(Book, borrow.book_id)
-            borrow.book_title = book.book_title if book else None
-
-            user = await db.get(User, borrow.user_id)
-            borrow.user_name = user.user_name if user else None
-
-        return borrows
+        return await BorrowCRUD.list_my_borrow_status(db, status=status, user_id=user_id)
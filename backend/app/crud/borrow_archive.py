@@ -0,0 +1,108 @@
+import logging
+from datetime import date, timedelta
+from typing import Optional, Set
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.borrow import CLOSED_BORROW_STATUSES, BorrowRecord
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_LOCK = 731_003  # pg advisory lock key for archive_closed
+ARCHIVE_TABLE = "borrow_records_archive"
+ARCHIVE_COLUMNS = (
+    "borrow_id, user_id, book_id, borrow_date, return_date, returned_at, borrow_status"
+)
+
+# Move one batch: the DELETE and the INSERT run as one statement, so a loan
+# is always in exactly one of the two tables. The counter triggers on both
+# tables cancel out.
+MOVE_BATCH = f"""
+    WITH moved AS (
+        DELETE FROM borrow_records
+        WHERE borrow_id = ANY(:borrow_ids)
+        RETURNING {ARCHIVE_COLUMNS}
+    )
+    INSERT INTO {ARCHIVE_TABLE} ({ARCHIVE_COLUMNS})
+    SELECT {ARCHIVE_COLUMNS} FROM moved
+"""
+
+
+def partition_name(year: int) -> str:
+    return f"{ARCHIVE_TABLE}_y{year}"
+
+
+async def ensure_partition(db: AsyncSession, year: int) -> None:
+    """Create the archive partition for `year` if it doesn't exist yet."""
+    await db.execute(
+        text(
+            f"CREATE TABLE IF NOT EXISTS {partition_name(year)} "
+            f"PARTITION OF {ARCHIVE_TABLE} "
+            f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+        )
+    )
+
+
+class BorrowArchiveCRUD:
+
+    @staticmethod
+    async def archive_closed(
+        db: AsyncSession,
+        older_than_days: Optional[int] = None,
+        batch_size: Optional[int] = None,
+    ) -> int:
+        """
+        Move closed loans (returned, rejected, pdf-viewed) that closed more
+        than `older_than_days` ago from borrow_records into the yearly
+        partitions of borrow_records_archive, `batch_size` rows per
+        transaction so locks stay short. One run at a time across workers.
+        Returns the number of loans moved.
+        """
+        if older_than_days is None:
+            older_than_days = settings.BORROW_ARCHIVE_AFTER_DAYS
+        if batch_size is None:
+            batch_size = settings.BORROW_ARCHIVE_BATCH_SIZE
+        cutoff = date.today() - timedelta(days=older_than_days)
+        closed_on = func.coalesce(
+            BorrowRecord.returned_at, BorrowRecord.return_date, BorrowRecord.borrow_date
+        )
+        partitions: Set[int] = set()
+        moved = 0
+        while True:
+            locked = await db.execute(select(func.pg_try_advisory_xact_lock(ARCHIVE_LOCK)))
+            if not locked.scalar():
+                await db.rollback()
+                break
+
+            batch = (
+                await db.execute(
+                    select(BorrowRecord.borrow_id, BorrowRecord.borrow_date)
+                    .where(
+                        BorrowRecord.borrow_status.in_(CLOSED_BORROW_STATUSES),
+                        closed_on < cutoff,
+                        BorrowRecord.borrow_date.is_not(None),
+                    )
+                    .limit(batch_size)
+                    .with_for_update(skip_locked=True)
+                )
+            ).all()
+            if not batch:
+                await db.rollback()
+                break
+
+            for year in {row.borrow_date.year for row in batch} - partitions:
+                await ensure_partition(db, year)
+                partitions.add(year)
+            result = await db.execute(
+                text(MOVE_BATCH), {"borrow_ids": [row.borrow_id for row in batch]}
+            )
+            await db.commit()
+            moved += result.rowcount
+            if len(batch) < batch_size:
+                break
+
+        if moved:
+            logger.info("Archived %s closed loan(s) older than %s", moved, cutoff)
+        return moved
@@ -0,0 +1,118 @@
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import desc, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.book import Book
+from app.models.circulation import CIRCULATION_METRICS, CirculationDaily
+from app.schemas.report import CirculationReport
+
+# Consume one batch of queued events and fold it into the daily rows. The
+# DELETE takes the events off the queue, so each is counted once; SKIP
+# LOCKED lets concurrent runs take disjoint batches, and upserting in key
+# order keeps them from deadlocking on circulation_daily.
+ROLLUP_BATCH = f"""
+    WITH batch AS (
+        SELECT event_id FROM circulation_events
+        ORDER BY event_id
+        LIMIT :batch_size
+        FOR UPDATE SKIP LOCKED
+    ),
+    consumed AS (
+        DELETE FROM circulation_events e USING batch
+        WHERE e.event_id = batch.event_id
+        RETURNING e.occurred_on, e.book_id, e.event
+    ),
+    totals AS (
+        SELECT occurred_on AS day, book_id,
+               {", ".join(f"count(*) FILTER (WHERE event = '{m}') AS {m}" for m in CIRCULATION_METRICS)}
+        FROM consumed GROUP BY occurred_on, book_id
+    ),
+    upserted AS (
+        INSERT INTO circulation_daily (day, book_id, category, {", ".join(CIRCULATION_METRICS)})
+        SELECT t.day, t.book_id, b.book_category, {", ".join(f"t.{m}" for m in CIRCULATION_METRICS)}
+        FROM totals t LEFT JOIN books b ON b.book_id = t.book_id
+        ORDER BY t.day, t.book_id
+        ON CONFLICT (day, book_id) DO UPDATE SET
+            category = coalesce(excluded.category, circulation_daily.category),
+            {", ".join(f"{m} = circulation_daily.{m} + excluded.{m}" for m in CIRCULATION_METRICS)}
+        RETURNING 1
+    )
+    SELECT (SELECT count(*) FROM consumed) AS events
+"""
+
+class CirculationCRUD:
+
+    @staticmethod
+    async def rollup(db: AsyncSession, batch_size: Optional[int] = None) -> int:
+        """
+        Fold the loan changes queued since the last run into
+        circulation_daily, `batch_size` events per transaction. Only new
+        events are read, never borrow_records. Returns the events processed.
+        """
+        if batch_size is None:
+            batch_size = settings.CIRCULATION_ROLLUP_BATCH_SIZE
+        processed = 0
+        while True:
+            result = await db.execute(text(ROLLUP_BATCH), {"batch_size": batch_size})
+            events = result.scalar_one()
+            await db.commit()
+            processed += events
+            if events < batch_size:
+                return processed
+
+    @staticmethod
+    async def get_report(
+        db: AsyncSession,
+        date_from: date,
+        date_to: date,
+        group_by: str = "day",
+        category: Optional[str] = None,
+        book_id: Optional[int] = None,
+        limit: int = 100,
+    ) -> CirculationReport:
+        """
+        Circulation between two days (inclusive) from the daily rollups,
+        grouped by day (oldest first), category or book (busiest first),
+        plus the totals over the whole range.
+        """
+        daily = CirculationDaily
+        metrics = [func.sum(getattr(daily, m)).label(m) for m in CIRCULATION_METRICS]
+        where = [daily.day >= date_from, daily.day <= date_to]
+        if category:
+            where.append(daily.category == category)
+        if book_id:
+            where.append(daily.book_id == book_id)
+
+        if group_by == "day":
+            query = select(daily.day, *metrics).group_by(daily.day).order_by(daily.day)
+        elif group_by == "category":
+            query = (
+                select(daily.category, *metrics)
+                .group_by(daily.category)
+                .order_by(desc("borrows"), daily.category)
+            )
+        else:
+            query = (
+                select(
+                    daily.book_id,
+                    Book.book_title,
+                    Book.book_category.label("category"),
+                    *metrics,
+                )
+                .outerjoin(Book, Book.book_id == daily.book_id)
+                .group_by(daily.book_id, Book.book_title, Book.book_category)
+                .order_by(desc("borrows"), daily.book_id)
+            )
+        rows = (await db.execute(query.where(*where).limit(limit))).mappings().all()
+        totals = (await db.execute(select(*metrics).where(*where))).mappings().one()
+
+        return CirculationReport(
+            date_from=date_from,
+            date_to=date_to,
+            group_by=group_by,
+            rows=[dict(row) for row in rows],
+            totals={m: totals[m] or 0 for m in CIRCULATION_METRICS},
+        )
@@ -0,0 +1,91 @@
+import logging
+from typing import Dict, Iterable
+
+from sqlalchemy import func, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.models.counter import Counter
+
+logger = logging.getLogger(__name__)
+
+BOOKS = "books"
+USERS = "users"
+
+
+def borrow_status_counter(status: str) -> str:
+    return f"borrow_status:{status}"
+
+
+# What the triggers maintain, recounted from scratch.
+ACTUAL_COUNTS = """
+    SELECT 'books' AS name, count(*) AS value FROM books
+    UNION ALL
+    SELECT 'users', count(*) FROM users
+    UNION ALL
+    SELECT 'borrow_status:' || coalesce(borrow_status, 'none'), count(*)
+    FROM (
+        SELECT borrow_status FROM borrow_records
+        UNION ALL
+        SELECT borrow_status FROM borrow_records_archive
+    ) loans GROUP BY 1
+"""
+
+# Repair drifted counters in one statement, without table locks. Stored
+# and actual values come from the same snapshot, so the upsert adds the
+# drift to whatever the row holds by then: writes committed meanwhile, or
+# still in flight on the counter row, keep their own deltas.
+REPAIR = f"""
+    WITH drift AS (
+        SELECT name, coalesce(c.value, 0) AS stored, coalesce(a.value, 0) AS actual
+        FROM ({ACTUAL_COUNTS}) a
+        FULL JOIN (
+            SELECT name, value FROM counters
+            WHERE name IN ('books', 'users') OR name LIKE 'borrow_status:%'
+        ) c USING (name)
+        WHERE coalesce(c.value, 0) <> coalesce(a.value, 0)
+    ),
+    repaired AS (
+        INSERT INTO counters (name, value)
+        SELECT name, actual - stored FROM drift
+        ON CONFLICT (name) DO UPDATE SET value = counters.value + excluded.value
+    )
+    SELECT name, stored, actual FROM drift
+"""
+
+RECONCILE_LOCK = 731_004  # pg advisory lock key for reconcile
+
+
+class CounterCRUD:
+
+    @staticmethod
+    async def get(db: AsyncSession, name: str) -> int:
+        result = await db.execute(select(Counter.value).where(Counter.name == name))
+        return result.scalar_one_or_none() or 0
+
+    @staticmethod
+    async def get_many(db: AsyncSession, names: Iterable[str]) -> Dict[str, int]:
+        names = list(names)
+        result = await db.execute(
+            select(Counter.name, Counter.value).where(Counter.name.in_(names))
+        )
+        values = dict(result.all())
+        return {name: values.get(name, 0) for name in names}
+
+    @staticmethod
+    async def reconcile(db: AsyncSession) -> Dict[str, int]:
+        """
+        Recount every trigger-maintained counter and repair any drift. No
+        table locks, so checkouts and returns carry on during the recount;
+        one run at a time across workers (advisory lock), the others return
+        {}. Returns {name: correction applied}.
+        """
+        locked = await db.execute(select(func.pg_try_advisory_xact_lock(RECONCILE_LOCK)))
+        if not locked.scalar():
+            await db.rollback()
+            return {}
+        drift = (await db.execute(text(REPAIR))).all()
+        await db.commit()
+        for name, stored, actual in drift:
+            logger.warning("Counter %s drifted: stored %s, actual %s", name, stored, actual)
+        return {name: actual - stored for name, stored, actual in drift}
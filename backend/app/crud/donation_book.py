@@ -2,8 +2,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from fastapi import HTTPException
 from app.models.donation_book import DonationBook
+from app.crud.book import BOOK_LISTS, catalog_changed
 from app.models.book import Book
 from app.models.category import Category
+from app.search.backends import get_search_backend
 
 
 class DonationBookCRUD:
@@ -55,4 +57,7 @@ class DonationBookCRUD:
 
         await db.commit()
         await db.refresh(donation)
+        if new_status == "accepted":
+            get_search_backend().index_book(new_book)
+            catalog_changed(new_book.book_id, *BOOK_LISTS)
         return donation
@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy import func
 from typing import Optional, Dict
+from app.crud.book import catalog_changed
 from app.models.book import Book
 from app.models.book_review import BookReview
 from app.models.user_rating import UserRating
@@ -50,6 +51,7 @@ class RateBookCRUD:
         book.book_rating = avg_rating
         await db.commit()
         await db.refresh(book)
+        catalog_changed(book_id, "popular")
 
         return book
 
@@ -0,0 +1,14 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app.models.resource_version import ResourceVersion
+
+
+class ResourceVersionCRUD:
+
+    @staticmethod
+    async def get_version(db: AsyncSession, resource: str) -> int:
+        """Current change counter of `resource` (a table name)."""
+        result = await db.execute(
+            select(ResourceVersion.version).where(ResourceVersion.resource == resource)
+        )
+        return result.scalar_one_or_none() or 0
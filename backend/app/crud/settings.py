@@ -18,6 +18,20 @@ class SettingsCRUD:
         result = await db.execute(select(Settings.borrow_max_limit))
         return result.scalar_one_or_none()
 
+    @staticmethod
+    async def get_borrow_limits(db: AsyncSession):
+        """(borrow_day_limit, borrow_max_limit) in one query, or None if unset."""
+        result = await db.execute(
+            select(Settings.borrow_day_limit, Settings.borrow_max_limit).limit(1)
+        )
+        return result.one_or_none()
+
+    @staticmethod
+    async def get_booking_days_limit(db: AsyncSession):
+        """Days a waiting hold lasts, or None if the settings row is missing."""
+        result = await db.execute(select(Settings.booking_days_limit).limit(1))
+        return result.scalar_one_or_none()
+
     @staticmethod
     async def get_settings(db: AsyncSession):
         result = await db.execute("SELECT * FROM settings LIMIT 1")
@@ -1,5 +1,10 @@
+import logging
+from typing import Dict
+
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, text
+from app.crud.counter import USERS, CounterCRUD
+from app.models.borrow import ACTIVE_BORROW_STATUSES
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
 from passlib.context import CryptContext
@@ -7,6 +12,28 @@ from fastapi import HTTPException, status
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+logger = logging.getLogger(__name__)
+
+# users.active_borrow_count recounted from borrow_records, for rows that
+# drifted. Stored and actual come from one snapshot and the drift is added
+# to the row as it stands by then, so concurrent checkouts and returns keep
+# their own changes and no table lock is needed.
+REPAIR_ACTIVE_BORROWS = """
+    UPDATE users u
+    SET active_borrow_count = greatest(u.active_borrow_count + a.actual - a.stored, 0)
+    FROM (
+        SELECT u.user_id, u.active_borrow_count AS stored, count(b.borrow_id) AS actual
+        FROM users u
+        LEFT JOIN borrow_records b
+          ON b.user_id = u.user_id AND b.borrow_status = ANY(:active)
+        GROUP BY u.user_id
+    ) a
+    WHERE u.user_id = a.user_id AND a.stored <> a.actual
+    RETURNING u.user_id, a.stored, a.actual
+"""
+
+ACTIVE_BORROWS_RECONCILE_LOCK = 731_005  # pg advisory lock key
+
 
 class UserCRUD:
 
@@ -19,8 +46,7 @@ class UserCRUD:
         """
         Return total number of users (members) in the system.
         """
-        result = await db.execute(select(func.count()).select_from(User))
-        return result.scalar_one()
+        return await CounterCRUD.get(db, USERS)
 
     @staticmethod
     async def get_user_by_name(db, user_name: str):
@@ -74,3 +100,30 @@ class UserCRUD:
         await db.delete(db_user)
         await db.commit()
         return True
+
+    @staticmethod
+    async def reconcile_active_borrows(db: AsyncSession) -> Dict[str, int]:
+        """
+        Recount every user's active loans and repair drifted
+        active_borrow_count values, without table locks so checkouts and
+        returns carry on. One run at a time across workers (advisory lock);
+        the others return {}. Returns {user_id: correction}.
+        """
+        locked = await db.execute(
+            select(func.pg_try_advisory_xact_lock(ACTIVE_BORROWS_RECONCILE_LOCK))
+        )
+        if not locked.scalar():
+            await db.rollback()
+            return {}
+        drift = (
+            await db.execute(
+                text(REPAIR_ACTIVE_BORROWS), {"active": list(ACTIVE_BORROW_STATUSES)}
+            )
+        ).all()
+        await db.commit()
+        for user_id, stored, actual in drift:
+            logger.warning(
+                "active_borrow_count for %s drifted: stored %s, actual %s",
+                user_id, stored, actual,
+            )
+        return {user_id: actual - stored for user_id, stored, actual in drift}
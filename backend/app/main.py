@@ -1,4 +1,5 @@
 import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from app.api import (
     auth,
@@ -12,13 +13,23 @@ from app.api import (
     donation_book,
     rate_book,
     book_review,
+    holds,
+    reports,
 )
+from app.core.jobs import start_background_jobs, stop_background_jobs
 from fastapi.middleware.cors import CORSMiddleware
 
 from fastapi_pagination import add_pagination
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    jobs = await start_background_jobs()
+    yield
+    await stop_background_jobs(jobs)
+
+
+app = FastAPI(lifespan=lifespan)
 
 add_pagination(app)
 
@@ -46,6 +57,8 @@ app.include_router(settings.router, prefix="/settings", tags=["Settings"])
 app.include_router(donation_book.router, prefix="/donation", tags=["Donation Book"])
 app.include_router(rate_book.router, prefix="/rate_book", tags=["Rate Book"])
 app.include_router(book_review.router, prefix="/book_review", tags=["Book Review"])
+app.include_router(holds.router, prefix="/holds", tags=["Holds"])
+app.include_router(reports.router, prefix="/reports", tags=["Reports"])
 
 
 @app.get("/")
@@ -1,7 +1,21 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime,Text,Float
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime,Text,Float, Computed, Index, FetchedValue
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from app.database import Base
 from datetime import datetime
+
+# Text search configuration used both for the stored vector and for queries.
+SEARCH_CONFIG = "english"
+
+# Weighted document: title (A) > author (B) > category (C) > description (D).
+SEARCH_VECTOR_EXPRESSION = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(book_title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(book_author, '')), 'B') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(book_category, '')), 'C') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(book_description, '')), 'D')"
+)
+
+
 class Book(Base):
     __tablename__ = "books"
 
@@ -18,5 +32,31 @@ class Book(Base):
     book_image = Column(String, nullable=True)
     book_audio = Column(String, nullable=True)
     book_pdf = Column(String, nullable=True)
-  
+    # Bumped by the books_bump_version trigger on every UPDATE; feeds ETags.
+    version = Column(
+        Integer, nullable=False, server_default="1", server_onupdate=FetchedValue()
+    )
+    search_vector = deferred(
+        Column(TSVECTOR, Computed(SEARCH_VECTOR_EXPRESSION, persisted=True))
+    )
 
+    __table_args__ = (
+        Index("ix_books_search_vector", "search_vector", postgresql_using="gin"),
+        # Trigram indexes (pg_trgm) serving typo-tolerant title/author suggestions.
+        Index(
+            "ix_books_book_title_trgm",
+            "book_title",
+            postgresql_using="gin",
+            postgresql_ops={"book_title": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_books_book_author_trgm",
+            "book_author",
+            postgresql_using="gin",
+            postgresql_ops={"book_author": "gin_trgm_ops"},
+        ),
+        # Popular / new / featured lists.
+        Index("ix_books_book_rating", book_rating.desc()),
+        Index("ix_books_created_at", created_at.desc()),
+        Index("ix_books_featured", "book_id", postgresql_where=featured),
+    )
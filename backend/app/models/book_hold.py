@@ -0,0 +1,45 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, TIMESTAMP, Index
+from sqlalchemy.sql import func
+from app.database import Base
+
+# waiting: queued for a copy; ready: a returned copy is set aside for the
+# holder until expires_at; claimed / cancelled / expired: closed.
+OPEN_HOLD_STATUSES = ("waiting", "ready")
+
+
+class BookHold(Base):
+    """FIFO queue of users waiting for a copy of a book (hold_id order)."""
+
+    __tablename__ = "book_holds"
+
+    hold_id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(String(50), ForeignKey("users.user_id", ondelete="CASCADE"), nullable=False)
+    book_id = Column(Integer, ForeignKey("books.book_id", ondelete="CASCADE"), nullable=False)
+    status = Column(String(20), nullable=False, default="waiting", server_default="waiting")
+    created_at = Column(TIMESTAMP, nullable=False, server_default=func.now())
+    ready_at = Column(TIMESTAMP, nullable=True)
+    expires_at = Column(TIMESTAMP, nullable=False)
+
+    __table_args__ = (
+        # Head of each book's queue.
+        Index(
+            "ix_book_holds_waiting_book_id",
+            "book_id",
+            "hold_id",
+            postgresql_where=status == "waiting",
+        ),
+        # Open holds by expiry, for the expiry sweep.
+        Index(
+            "ix_book_holds_open_expires_at",
+            "expires_at",
+            postgresql_where=status.in_(OPEN_HOLD_STATUSES),
+        ),
+        # One open hold per user and book.
+        Index(
+            "uq_book_holds_open_user_book",
+            "user_id",
+            "book_id",
+            unique=True,
+            postgresql_where=status.in_(OPEN_HOLD_STATUSES),
+        ),
+    )
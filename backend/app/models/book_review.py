@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, TIMESTAMP
+from sqlalchemy import Column, Integer, String, ForeignKey, TIMESTAMP, Index
 from sqlalchemy.sql import func
 from app.database import Base
 
@@ -10,3 +10,7 @@ class BookReview(Base):
     book_id = Column(Integer, ForeignKey("books.book_id", ondelete="CASCADE"), nullable=False)
     review_text = Column(String, nullable=False)
     created_at = Column(TIMESTAMP, server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_book_reviews_book_id_created_at", "book_id", "created_at"),
+    )
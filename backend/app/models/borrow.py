@@ -1,6 +1,15 @@
-from sqlalchemy import Column, Integer, ForeignKey, Date, String
+from sqlalchemy import (
+    Column, Integer, ForeignKey, Date, String, Index, TIMESTAMP, PrimaryKeyConstraint,
+)
+from sqlalchemy.sql import func
 from app.database import Base
 
+# Loans that still hold a copy (or a claim on one).
+ACTIVE_BORROW_STATUSES = ("pending", "accepted", "overdue")
+# Finished loans; old enough ones move to borrow_records_archive.
+CLOSED_BORROW_STATUSES = ("returned", "rejected", "pdf-viewed")
+BORROW_STATUSES = ACTIVE_BORROW_STATUSES + CLOSED_BORROW_STATUSES
+
 class BorrowRecord(Base):
     __tablename__ = "borrow_records"
 
@@ -12,7 +21,59 @@ class BorrowRecord(Base):
     returned_at = Column(Date, nullable=True)
     borrow_status = Column(String(50), default="pending")
 
+    __table_args__ = (
+        Index("ix_borrow_records_user_book_status", "user_id", "book_id", "borrow_status"),
+        Index("ix_borrow_records_book_id", "book_id"),
+        Index("ix_borrow_records_borrow_status", "borrow_status"),
+        Index("ix_borrow_records_borrow_date", "borrow_date", "borrow_id"),
+        Index("ix_borrow_records_return_date", "return_date", "borrow_id"),
+        # At most one active loan of a book per user, enforced by the database.
+        Index(
+            "uq_borrow_records_active_user_book",
+            "user_id",
+            "book_id",
+            unique=True,
+            postgresql_where=borrow_status.in_(ACTIVE_BORROW_STATUSES),
+        ),
+        # Open loans by due date, for the overdue sweep.
+        Index(
+            "ix_borrow_records_open_return_date",
+            "return_date",
+            postgresql_where=borrow_status.in_(("pending", "accepted")),
+        ),
+        # Closed loans by the day they closed, for the archival job.
+        Index(
+            "ix_borrow_records_closed_on",
+            func.coalesce(returned_at, return_date, borrow_date),
+            postgresql_where=borrow_status.in_(CLOSED_BORROW_STATUSES),
+        ),
+    )
+
 
+class BorrowRecordArchive(Base):
+    """
+    Closed loans moved out of borrow_records by BorrowArchiveCRUD, range
+    partitioned by borrow_date (one partition per year, created on demand).
+    Same columns as BorrowRecord plus archived_at; rows are never updated.
+    """
 
+    __tablename__ = "borrow_records_archive"
 
+    borrow_id = Column(Integer, nullable=False)
+    user_id = Column(String(50), ForeignKey("users.user_id", ondelete="CASCADE"))
+    book_id = Column(Integer, ForeignKey("books.book_id", ondelete="CASCADE"))
+    borrow_date = Column(Date, nullable=False)
+    return_date = Column(Date, nullable=True)
+    returned_at = Column(Date, nullable=True)
+    borrow_status = Column(String(50))
+    archived_at = Column(TIMESTAMP, nullable=False, server_default=func.now())
 
+    __table_args__ = (
+        # The partition key has to be part of the primary key.
+        PrimaryKeyConstraint("borrow_id", "borrow_date"),
+        Index("ix_borrow_records_archive_user_status", "user_id", "borrow_status"),
+        Index("ix_borrow_records_archive_book_id", "book_id"),
+        Index("ix_borrow_records_archive_borrow_date", "borrow_date", "borrow_id"),
+        Index("ix_borrow_records_archive_return_date", "return_date", "borrow_id"),
+        {"postgresql_partition_by": "RANGE (borrow_date)"},
+    )
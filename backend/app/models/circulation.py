@@ -0,0 +1,35 @@
+from sqlalchemy import BigInteger, Column, Date, Integer, String
+from sqlalchemy.sql import func
+from app.database import Base
+
+# Metrics counted per day and book; event names in circulation_events match.
+CIRCULATION_METRICS = ("borrows", "returns", "rejections", "overdues", "pdf_views")
+
+
+class CirculationEvent(Base):
+    """
+    Loan changes queued by a trigger on borrow_records, waiting to be
+    folded into circulation_daily by CirculationCRUD.rollup.
+    """
+
+    __tablename__ = "circulation_events"
+
+    event_id = Column(BigInteger, primary_key=True, autoincrement=True)
+    occurred_on = Column(Date, nullable=False, server_default=func.current_date())
+    book_id = Column(Integer, nullable=False)
+    event = Column(String(20), nullable=False)
+
+
+class CirculationDaily(Base):
+    """Circulation counts per day and book (category copied from the book)."""
+
+    __tablename__ = "circulation_daily"
+
+    day = Column(Date, primary_key=True)
+    book_id = Column(Integer, primary_key=True)
+    category = Column(String, nullable=True)
+    borrows = Column(Integer, nullable=False, default=0, server_default="0")
+    returns = Column(Integer, nullable=False, default=0, server_default="0")
+    rejections = Column(Integer, nullable=False, default=0, server_default="0")
+    overdues = Column(Integer, nullable=False, default=0, server_default="0")
+    pdf_views = Column(Integer, nullable=False, default=0, server_default="0")
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, String, BigInteger
+from app.database import Base
+
+
+class Counter(Base):
+    """
+    Row counts kept current by triggers on books, users and borrow_records,
+    so dashboard counts are a primary-key lookup instead of COUNT(*).
+    """
+
+    __tablename__ = "counters"
+
+    name = Column(String(100), primary_key=True)
+    value = Column(BigInteger, nullable=False, default=0)
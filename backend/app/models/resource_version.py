@@ -0,0 +1,11 @@
+from sqlalchemy import Column, String, BigInteger
+from app.database import Base
+
+
+class ResourceVersion(Base):
+    """Change counter per table, bumped by triggers on every write statement."""
+
+    __tablename__ = "resource_versions"
+
+    resource = Column(String(50), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=1)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, TIMESTAMP
+from sqlalchemy import Column, Integer, String, TIMESTAMP, Index
 from sqlalchemy.sql import func
 from app.database import Base
 import uuid
@@ -15,6 +15,13 @@ class User(Base):
     password = Column(String(255), nullable=False)
     role = Column(String(50), default="user")
     created_at = Column(TIMESTAMP, server_default=func.now())
+    # Loans in ACTIVE_BORROW_STATUSES; kept in step by BorrowCRUD, repaired
+    # by UserCRUD.reconcile_active_borrows.
+    active_borrow_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        Index("ix_users_user_name", "user_name"),  # login lookup
+    )
 
 
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, DECIMAL, UniqueConstraint, String
+from sqlalchemy import Column, Integer, ForeignKey, DECIMAL, UniqueConstraint, String, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -12,4 +12,5 @@ class UserRating(Base):
 
     __table_args__ = (
         UniqueConstraint('user_id', 'book_id', name='uix_user_book'),  
+        Index('ix_user_rating_book_id_rating', 'book_id', 'rating'),
     )
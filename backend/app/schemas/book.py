@@ -1,8 +1,11 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Dict, List, Optional
 from pydantic import Field, HttpUrl
 from datetime import datetime
 from fastapi import Form
+from fastapi_pagination import Page
+from app.schemas.book_review import BookReviewOut
+from app.schemas.borrow import BorrowRecord
 
 
 class BookDetail(BaseModel):
@@ -20,9 +23,76 @@ class BookDetail(BaseModel):
     book_audio: Optional[str] = None
     book_pdf: Optional[str] = None
 
-    class Config:
-        orm_mode = True
-        allow_population_by_field_name = True
+    model_config = {"from_attributes": True, "populate_by_name": True}
+
+
+class BookSummary(BaseModel):
+    """Grid/card projection; `?fields=summary` on the list endpoints."""
+
+    book_id: int
+    book_title: str
+    book_author: str
+    book_image: Optional[str] = None
+    book_rating: float
+
+
+class BookFacets(BaseModel):
+    category: Dict[str, int] = {}
+    availability: Dict[str, int] = {}  # "true" | "false"
+    has_pdf: Dict[str, int] = {}
+    has_audio: Dict[str, int] = {}
+    rating: Dict[str, int] = {}  # "0-1" ... "4-5"
+
+
+class BookPage(Page[BookDetail]):
+    facets: Optional[BookFacets] = None
+    # True when a search hit the backend's max_hits: total counts only the
+    # matches served, and more may exist.
+    search_capped: bool = False
+
+
+class BookCursorPage(BaseModel):
+    items: List[BookDetail]
+    next_cursor: Optional[str] = None
+
+
+class BookSuggestion(BaseModel):
+    value: str
+    field: str  # "title" | "author"
+    score: float
+
+
+class BookHomeFeed(BaseModel):
+    featured: List[BookDetail]
+    popular: List[BookDetail]
+    new: List[BookDetail]
+
+
+class BookRatingSummary(BaseModel):
+    total: int
+    overall: float
+    breakdown: Dict[int, int]  # star -> percentage of ratings
+
+
+class BookBundle(BaseModel):
+    book: BookDetail
+    rating: BookRatingSummary
+    reviews: List[BookReviewOut]
+    reviews_total: int
+    borrow: Optional[BorrowRecord] = None  # caller's active borrow, if any
+
+
+class BookImportError(BaseModel):
+    line: int
+    errors: List[Dict[str, str]]
+
+
+class BookImportResult(BaseModel):
+    total_rows: int
+    imported: int
+    skipped_duplicates: int  # title + author already in the catalog or the file
+    failed: int
+    errors: List[BookImportError]  # first MAX_REPORTED_ERRORS failures
 
 
 class BookDetail2(BaseModel):
@@ -40,9 +110,7 @@ class BookDetail2(BaseModel):
     book_count: int
     created_at: datetime
 
-    class Config:
-        orm_mode = True
-        allow_population_by_field_name = True
+    model_config = {"from_attributes": True, "populate_by_name": True}
 
 
 class BookCreate(BaseModel):
@@ -59,8 +127,7 @@ class BookCreate(BaseModel):
     book_audio: Optional[str] = None
     book_pdf: Optional[str] = None
 
-    class Config:
-        orm_mode = True
+    model_config = {"from_attributes": True}
 
 
 class BookUpdate(BaseModel):
@@ -76,8 +143,7 @@ class BookUpdate(BaseModel):
     book_audio: Optional[str] = None
     book_pdf: Optional[str] = None
 
-    class Config:
-        orm_mode = True
+    model_config = {"from_attributes": True}
 
     @classmethod
     def as_form(
@@ -107,12 +173,10 @@ class RateBook(BaseModel):
     book_id: int
     book_rating: float
 
-    class Config:
-        orm_mode = True
+    model_config = {"from_attributes": True}
 
 
 class UpoadateFeatures(BaseModel):
     featured: bool
 
-    class Config:
-        orm_mode = True
+    model_config = {"from_attributes": True}
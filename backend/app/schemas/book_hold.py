@@ -0,0 +1,21 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class HoldCreate(BaseModel):
+    book_id: int
+
+
+class HoldOut(BaseModel):
+    hold_id: int
+    book_id: int
+    book_title: Optional[str] = None
+    status: str  # waiting / ready
+    created_at: datetime
+    ready_at: Optional[datetime] = None
+    expires_at: datetime  # claim (ready) or queue (waiting) deadline
+    position: Optional[int] = None  # place in the queue while waiting
+
+    model_config = {"from_attributes": True}
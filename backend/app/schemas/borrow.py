@@ -1,10 +1,13 @@
 from pydantic import BaseModel, Field, validator
 from datetime import date
-from typing import Optional, List
+from typing import Dict, Literal, Optional, List
 
 BORROW_STATUS = {"borrowed", "returned", "overdue"}
 REQUEST_STATUS = {"accept", "pending", "reject"}
 
+# Statuses the circulation desk can move a loan to.
+LoanStatus = Literal["pending", "accepted", "overdue", "returned", "rejected"]
+
 
 class BorrowRequestRecord(BaseModel):
     borrow_id: int
@@ -17,8 +20,7 @@ class BorrowRequestRecord(BaseModel):
     return_date: date
     borrow_status: str
 
-    class Config:
-        orm_mode = True
+    model_config = {"from_attributes": True}
 
 
 class BorrowRecord(BaseModel):
@@ -29,8 +31,7 @@ class BorrowRecord(BaseModel):
     return_date: date
     borrow_status: str
 
-    class Config:
-        orm_mode = True
+    model_config = {"from_attributes": True}
 
 
 class BorrowCreate(BaseModel):
@@ -77,5 +78,46 @@ class BorrowDetailResponse(BaseModel):
     borrow_status: str
     returned_at: Optional[date] = None
 
-    class Config:
-        orm_mode = True
+    model_config = {"from_attributes": True}
+
+
+class BorrowLedgerEntry(BorrowDetailResponse):
+    # Both dates are nullable columns, and the ledger pages NULLs too.
+    borrow_date: Optional[date] = None
+    return_date: Optional[date] = None
+    user_email: Optional[str] = None
+
+
+class BorrowLedgerPage(BaseModel):
+    items: List[BorrowLedgerEntry]
+    next_cursor: Optional[str] = None
+
+
+class BorrowStatusChange(BaseModel):
+    borrow_id: int
+    status: LoanStatus
+
+
+class BorrowBulkStatusUpdate(BaseModel):
+    changes: List[BorrowStatusChange] = Field(..., min_length=1, max_length=1000)
+
+
+class BorrowBulkItemResult(BaseModel):
+    borrow_id: int
+    ok: bool
+    previous_status: Optional[str] = None
+    borrow_status: Optional[str] = None
+    detail: Optional[str] = None  # why the change was not applied
+
+
+class BorrowBulkStatusResult(BaseModel):
+    updated: int
+    failed: int
+    results: List[BorrowBulkItemResult]
+
+
+class BorrowSummary(BaseModel):
+    scope: Literal["user", "all"]
+    counts: Dict[str, int]  # every status, zero if none
+    active: int  # pending + accepted + overdue
+    total: int
@@ -0,0 +1,28 @@
+from datetime import date
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel
+
+
+class CirculationTotals(BaseModel):
+    borrows: int = 0
+    returns: int = 0
+    rejections: int = 0
+    overdues: int = 0
+    pdf_views: int = 0
+
+
+class CirculationRow(CirculationTotals):
+    # Set according to the report's group_by.
+    day: Optional[date] = None
+    category: Optional[str] = None
+    book_id: Optional[int] = None
+    book_title: Optional[str] = None
+
+
+class CirculationReport(BaseModel):
+    date_from: date
+    date_to: date
+    group_by: Literal["day", "category", "book"]
+    rows: List[CirculationRow]
+    totals: CirculationTotals
@@ -0,0 +1,117 @@
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Optional
+
+from sqlalchemy import desc, false, func, literal_column, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.book import Book, SEARCH_CONFIG
+from app.search.bm25 import BM25Index
+
+
+class SearchBackend(ABC):
+    """
+    Catalog search used by BookCRUD.get_all.
+    `apply` narrows a `select(Book)` to the matches, best match first; the
+    index hooks are called by BookCRUD after every write. A backend with
+    `max_hits` set keeps only that many of the best matches.
+    """
+
+    in_memory = False
+    max_hits: Optional[int] = None
+
+    @abstractmethod
+    def apply(self, query, search: str, category: Optional[str] = None):
+        """Narrow `query` to the books matching `search`, best match first."""
+
+    def index_book(self, book: Book) -> None:
+        pass
+
+    def remove_book(self, book_id: int) -> None:
+        pass
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        pass
+
+
+class PostgresSearchBackend(SearchBackend):
+    """Full-text search on the GIN-indexed `books.search_vector` column."""
+
+    def apply(self, query, search: str, category: Optional[str] = None):
+        tsquery = func.websearch_to_tsquery(literal_column(f"'{SEARCH_CONFIG}'"), search)
+        return query.filter(Book.search_vector.op("@@")(tsquery)).order_by(
+            desc(func.ts_rank(Book.search_vector, tsquery))
+        )
+
+
+class BM25SearchBackend(SearchBackend):
+    """
+    Ranks in process with an in-memory BM25 index, then fetches only the
+    page of matching rows by primary key. Each worker holds its own index,
+    built at startup and refreshed every SEARCH_INDEX_REFRESH_SECONDS so
+    writes served by other workers are picked up. Only the best `max_hits`
+    (SEARCH_MAX_HITS) matches are kept.
+    """
+
+    in_memory = True
+
+    def __init__(self, max_hits: Optional[int] = None):
+        self.index = BM25Index()
+        self.max_hits = max_hits or settings.SEARCH_MAX_HITS
+
+    def apply(self, query, search: str, category: Optional[str] = None):
+        ranked = [
+            book_id
+            for book_id, _ in self.index.search(search, category, limit=self.max_hits)
+        ]
+        if not ranked:
+            return query.filter(false())
+        return query.filter(Book.book_id.in_(ranked)).order_by(
+            func.array_position(postgresql.array(ranked), Book.book_id)
+        )
+
+    def index_book(self, book: Book) -> None:
+        self.index.add(book.book_id, _book_fields(book))
+
+    def remove_book(self, book_id: int) -> None:
+        self.index.remove(book_id)
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        index = BM25Index()
+        result = await db.stream(
+            select(
+                Book.book_id,
+                Book.book_title,
+                Book.book_author,
+                Book.book_category,
+                Book.book_description,
+            ).execution_options(yield_per=1000)
+        )
+        async for row in result.mappings():
+            index.add(row["book_id"], row)
+        self.index = index
+
+
+def _book_fields(book: Book) -> dict:
+    return {
+        "book_title": book.book_title,
+        "book_author": book.book_author,
+        "book_category": book.book_category,
+        "book_description": book.book_description,
+    }
+
+
+SEARCH_BACKENDS = {
+    "postgres": PostgresSearchBackend,
+    "bm25": BM25SearchBackend,
+}
+
+
+@lru_cache
+def get_search_backend() -> SearchBackend:
+    try:
+        return SEARCH_BACKENDS[settings.SEARCH_BACKEND]()
+    except KeyError:
+        raise ValueError(f"Unknown SEARCH_BACKEND: {settings.SEARCH_BACKEND}")
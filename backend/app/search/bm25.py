@@ -0,0 +1,111 @@
+import heapq
+import math
+import re
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from in is it of on or the to with".split()
+)
+
+# Field -> weight; a title hit counts as three occurrences of the term.
+FIELD_WEIGHTS = (
+    ("book_title", 3),
+    ("book_author", 2),
+    ("book_category", 1),
+    ("book_description", 1),
+)
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    if not text:
+        return []
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOP_WORDS]
+
+
+class BM25Index:
+    """
+    In-memory inverted index ranked with Okapi BM25.
+
+    Each term maps to two parallel arrays sorted by book_id: the ids of the
+    books containing it and the (field-weighted) term frequencies, so an
+    index over a large catalog stays compact and updates are bisect inserts.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        self._doc_terms: Dict[int, Tuple[str, ...]] = {}
+        self._doc_len: Dict[int, int] = {}
+        self._category: Dict[int, str] = {}
+        self._total_len = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_len)
+
+    def add(self, book_id: int, fields: Dict[str, Optional[str]]) -> None:
+        """Index (or re-index) one book from its text fields."""
+        self.remove(book_id)
+
+        frequencies: Dict[str, int] = defaultdict(int)
+        for field, weight in FIELD_WEIGHTS:
+            for token in tokenize(fields.get(field)):
+                frequencies[token] += weight
+
+        for token, tf in frequencies.items():
+            ids, tfs = self._postings.setdefault(token, (array("l"), array("I")))
+            pos = bisect_left(ids, book_id)
+            ids.insert(pos, book_id)
+            tfs.insert(pos, tf)
+
+        length = sum(frequencies.values())
+        self._doc_terms[book_id] = tuple(frequencies)
+        self._doc_len[book_id] = length
+        self._category[book_id] = fields.get("book_category") or ""
+        self._total_len += length
+
+    def remove(self, book_id: int) -> None:
+        terms = self._doc_terms.pop(book_id, None)
+        if terms is None:
+            return
+        for token in terms:
+            ids, tfs = self._postings[token]
+            pos = bisect_left(ids, book_id)
+            if pos < len(ids) and ids[pos] == book_id:
+                del ids[pos]
+                del tfs[pos]
+            if not ids:
+                del self._postings[token]
+        self._total_len -= self._doc_len.pop(book_id)
+        self._category.pop(book_id, None)
+
+    def search(
+        self, query: str, category: Optional[str] = None, limit: int = 1000
+    ) -> List[Tuple[int, float]]:
+        """Best `limit` (book_id, score) pairs for `query`, highest score first."""
+        n_docs = len(self._doc_len)
+        if not n_docs:
+            return []
+        avg_len = self._total_len / n_docs
+
+        scores: Dict[int, float] = defaultdict(float)
+        for token in set(tokenize(query)):
+            posting = self._postings.get(token)
+            if posting is None:
+                continue
+            ids, tfs = posting
+            df = len(ids)
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            for book_id, tf in zip(ids, tfs):
+                norm = 1 - self.b + self.b * self._doc_len[book_id] / avg_len
+                scores[book_id] += idf * tf * (self.k1 + 1) / (tf + self.k1 * norm)
+
+        hits: Iterable[Tuple[int, float]] = scores.items()
+        if category:
+            hits = ((i, s) for i, s in hits if self._category.get(i) == category)
+        return heapq.nlargest(limit, hits, key=lambda hit: (hit[1], -hit[0]))
@@ -0,0 +1,116 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Hashable, Iterable, Optional, Set
+
+from app.config import settings
+
+
+class ResponseCache:
+    """
+    Bounded LRU cache with a TTL and tag-based invalidation.
+
+    Each entry is stored with a set of tags (e.g. "book:42", "list:popular");
+    `invalidate("book:42")` drops every entry carrying that tag, so writers
+    evict exactly the responses they made stale.
+    """
+
+    def __init__(self, max_entries: int = 2048, ttl_seconds: int = 60):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._tags: Dict[str, Set[Hashable]] = {}
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, tags: Iterable[str] = ()) -> None:
+        tags = frozenset(tags)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, *tags: str) -> None:
+        with self._lock:
+            for tag in tags:
+                for key in self._tags.pop(tag, set()):
+                    if key in self._entries:
+                        self._drop(key)
+                        self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    def _drop(self, key: Hashable) -> None:
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+response_cache = ResponseCache(
+    max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+)
+
+# Dashboard status counts; short-lived because other workers' writes can't
+# invalidate this worker's copy.
+summary_cache = ResponseCache(
+    max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.BORROW_SUMMARY_TTL_SECONDS,
+)
+
+ALL_BORROWS_TAG = "borrows:all"
+# Every cached facet count; any catalog or availability change evicts them.
+FACETS_TAG = "facets"
+
+
+def book_tag(book_id: int) -> str:
+    return f"book:{book_id}"
+
+
+def borrower_tag(user_id: str) -> str:
+    return f"borrows:{user_id}"
+
+
+def copies_changed(*book_ids: int) -> None:
+    """Evict responses made stale by copies leaving or returning to the shelf."""
+    response_cache.invalidate(FACETS_TAG, *(book_tag(book_id) for book_id in book_ids))
@@ -0,0 +1,38 @@
+import csv
+import io
+from typing import AsyncIterator, Iterable, List, Sequence
+
+import orjson
+
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+async def csv_chunks(
+    columns: List[str], batches: AsyncIterator[Sequence[Iterable]]
+) -> AsyncIterator[bytes]:
+    """Header first (so the client gets bytes at once), then one chunk per batch."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue().encode()
+    async for rows in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(rows)
+        yield buffer.getvalue().encode()
+
+
+async def ndjson_chunks(
+    columns: List[str], batches: AsyncIterator[Sequence[Iterable]]
+) -> AsyncIterator[bytes]:
+    async for rows in batches:
+        yield b"".join(
+            orjson.dumps(dict(zip(columns, row)), option=orjson.OPT_APPEND_NEWLINE)
+            for row in rows
+        )
+
+
+EXPORT_WRITERS = {"csv": csv_chunks, "ndjson": ndjson_chunks}
@@ -0,0 +1,30 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from app.core.exceptions import validation_error
+
+
+def parse_fields(
+    fields: Optional[str],
+    allowed: Sequence[str],
+    presets: Dict[str, Sequence[str]],
+    always: Sequence[str] = (),
+) -> Optional[List[str]]:
+    """
+    Resolve a `?fields=` value: a preset name or a comma-separated list of
+    attribute names. None means "everything". `always` fields are added
+    so rows stay addressable.
+    """
+    if not fields:
+        return None
+    if fields in presets:
+        return list(presets[fields])
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in allowed]
+    if unknown:
+        raise validation_error({"fields": f"UNKNOWN_FIELDS: {', '.join(unknown)}"})
+    return [*(f for f in always if f not in requested), *requested]
+
+
+def project(objects: Iterable[Any], fields: Sequence[str]) -> List[Dict[str, Any]]:
+    """Plain dicts holding only `fields` of each object."""
+    return [{f: getattr(obj, f) for f in fields} for obj in objects]
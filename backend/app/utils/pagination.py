@@ -1,4 +1,17 @@
-from typing import Optional
+import base64
+import json
+from typing import Any, List
+
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from app.core.exceptions import validation_error
+
+# Renders :name placeholders, which text() binds back to the compiled params.
+EXPLAIN_DIALECT = postgresql.dialect(paramstyle="named")
+
 
 def paginate(queryset: list, page: int = 1, page_size: int = 20):
     total = len(queryset)
@@ -9,3 +22,57 @@ def paginate(queryset: list, page: int = 1, page_size: int = 20):
         "data": data,
         "meta": {"total": total, "page": page, "page_size": page_size}
     }
+
+
+async def exact_count(db: AsyncSession, query: Select) -> int:
+    """COUNT(*) over the rows matched by ``query`` (ordering is dropped)."""
+    subquery = query.order_by(None).subquery()
+    result = await db.execute(select(func.count()).select_from(subquery))
+    return result.scalar_one()
+
+
+async def estimate_count(db: AsyncSession, query: Select) -> int:
+    """
+    Planner row estimate for ``query``.
+    Runs EXPLAIN only, so the cost does not grow with the table size.
+    """
+    plan = await explain(db, query.order_by(None))
+    return int(plan["Plan Rows"])
+
+
+async def explain(db, query: Select) -> dict:
+    """
+    Top plan node of EXPLAIN (FORMAT JSON) for ``query`` on a session or
+    connection. Values (search text included) go as bound parameters.
+    """
+    compiled = query.compile(
+        dialect=EXPLAIN_DIALECT, compile_kwargs={"render_postcompile": True}
+    )
+    result = await db.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}"), compiled.params)
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+async def count_rows(db: AsyncSession, query: Select, mode: str = "exact") -> int:
+    """Total for a page: ``exact`` COUNT(*) or planner ``estimate``."""
+    if mode == "estimate":
+        return await estimate_count(db, query)
+    return await exact_count(db, query)
+
+
+def encode_cursor(*values: Any) -> str:
+    """Opaque keyset cursor holding the sort values of the last row served."""
+    raw = json.dumps(list(values), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        raise validation_error({"cursor": "INVALID_CURSOR"})
+    if not isinstance(values, list) or len(values) != size:
+        raise validation_error({"cursor": "INVALID_CURSOR"})
+    return values
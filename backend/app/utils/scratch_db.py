@@ -0,0 +1,88 @@
+"""
+Throwaway, seeded copies of the schema for checks that need a real
+PostgreSQL: the query plan tests and `python -m app.cli check-checkout`.
+They run on CHECK_DATABASE_URL, never on DATABASE_URL.
+"""
+import uuid
+from contextlib import asynccontextmanager
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.config import settings
+from app.database import Base
+import app.models.settings  # noqa: F401  (every table, for the scratch schema)
+from app.models import (  # noqa: F401
+    book,
+    book_hold,
+    book_review,
+    borrow,
+    category,
+    circulation,
+    counter,
+    donation_book,
+    resource_version,
+    user,
+    user_rating,
+)
+
+# A small library: limits, a few hundred books, users and loans, and some
+# reviews and ratings.
+SCRATCH_SEED = (
+    "INSERT INTO settings (borrow_day_limit, borrow_day_extension_limit, "
+    "borrow_max_limit, booking_duration, booking_days_limit) VALUES (14, 7, 5, 2, 30)",
+    "INSERT INTO users (user_id, user_name, user_email, password, role) "
+    "SELECT 'u' || g, 'user' || g, 'user' || g || '@example.com', 'x', 'user' "
+    "FROM generate_series(1, 200) g",
+    "INSERT INTO books (book_title, book_category, book_author, available_copies, "
+    "book_availabity, featured, book_rating, created_at) "
+    "SELECT 'Title ' || g, 'Category ' || (g % 10), 'Author ' || (g % 50), g % 4, "
+    "g % 4 > 0, g % 10 = 0, (g % 50) / 10.0, now() - make_interval(hours => g) "
+    "FROM generate_series(1, 500) g",
+    "INSERT INTO borrow_records (user_id, book_id, borrow_date, return_date, borrow_status) "
+    "SELECT 'u' || (g % 200 + 1), g % 500 + 1, current_date - g % 60, "
+    "current_date - g % 60 + 14, (ARRAY['pending', 'accepted', 'returned'])[g % 3 + 1] "
+    "FROM generate_series(1, 300) g",
+    "INSERT INTO book_reviews (user_id, book_id, review_text) "
+    "SELECT 'u' || (g % 200 + 1), g % 500 + 1, 'Review ' || g "
+    "FROM generate_series(1, 400) g",
+    "INSERT INTO user_rating (user_id, book_id, rating) "
+    "SELECT 'u' || (g % 200 + 1), g % 500 + 1, g % 5 + 1 "
+    "FROM generate_series(1, 400) g",
+    "ANALYZE",
+)
+
+
+def check_database_url() -> str:
+    """CHECK_DATABASE_URL, refusing a missing one or one that is DATABASE_URL."""
+    url = settings.CHECK_DATABASE_URL
+    if not url:
+        raise ValueError("Set CHECK_DATABASE_URL to a test database to run checks.")
+    check, live = make_url(url), make_url(settings.DATABASE_URL)
+    if (check.host, check.port, check.database) == (live.host, live.port, live.database):
+        raise ValueError("CHECK_DATABASE_URL must not point at DATABASE_URL.")
+    return url
+
+
+@asynccontextmanager
+async def scratch_db(url: str):
+    """
+    An engine on `url` whose connections work in a throwaway schema holding
+    every table, seeded by SCRATCH_SEED. The schema is dropped on exit.
+    """
+    schema = f"lms_check_{uuid.uuid4().hex[:12]}"
+    scratch = create_async_engine(
+        url, connect_args={"server_settings": {"search_path": f"{schema}, public"}}
+    )
+    try:
+        async with scratch.begin() as conn:
+            await conn.exec_driver_sql(f"CREATE SCHEMA {schema}")
+            # checkfirst would find same-named tables further up the search path.
+            await conn.run_sync(Base.metadata.create_all, checkfirst=False)
+            for statement in SCRATCH_SEED:
+                await conn.exec_driver_sql(statement)
+        yield scratch
+    finally:
+        async with scratch.begin() as conn:
+            await conn.exec_driver_sql(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+        await scratch.dispose()
@@ -0,0 +1,30 @@
+from functools import lru_cache
+from typing import Any
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def adapter(tp: Any) -> TypeAdapter:
+    """TypeAdapter for `tp`, built (and its serializer compiled) once per type."""
+    return TypeAdapter(tp)
+
+
+def dump_json(tp: Any, value: Any) -> bytes:
+    """
+    Validate `value` (ORM objects allowed) as `tp` and encode it to JSON in
+    one pass through pydantic-core, skipping FastAPI's response_model
+    re-validation and the jsonable_encoder/json.dumps round trip.
+    """
+    type_adapter = adapter(tp)
+    return type_adapter.dump_json(type_adapter.validate_python(value, from_attributes=True))
+
+
+def json_response(tp: Any, value: Any) -> Response:
+    return Response(content=dump_json(tp, value), media_type="application/json")
+
+
+def raw_json_response(content: bytes) -> Response:
+    """Response for JSON that was encoded earlier (e.g. held in the response cache)."""
+    return Response(content=content, media_type="application/json")
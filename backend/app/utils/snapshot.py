@@ -0,0 +1,73 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import service_unavailable_error
+from app.core.jobs import run_job
+from app.database import async_session
+
+logger = logging.getLogger(__name__)
+
+
+class Snapshot:
+    """
+    A value computed by `build(db)` and served from memory.
+
+    `invalidate()` schedules a rebuild in the background; readers keep getting
+    the previous value until it finishes, so reads never wait on the database
+    once the first build is done. Until a build has succeeded, reads raise a
+    503 instead of serving nothing. Values older than `max_age_seconds` are
+    refreshed the same way, which also picks up writes made on other workers.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        build: Callable[[AsyncSession], Awaitable[Any]],
+        max_age_seconds: int = 60,
+    ):
+        self.name = name
+        self._build = build
+        self.max_age_seconds = max_age_seconds
+        self._value: Optional[Any] = None
+        self._built_at = 0.0
+        self._dirty = False
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    async def get(self) -> Any:
+        if self._value is None:
+            async with self._lock:
+                if self._value is None:
+                    await self._first_build()
+        elif time.monotonic() - self._built_at > self.max_age_seconds:
+            self.invalidate()
+        return self._value
+
+    async def _first_build(self) -> None:
+        # Nothing to fall back on yet, so a failure is the caller's (503),
+        # not a logged background error; the next read tries again.
+        try:
+            async with async_session() as db:
+                await self._refresh(db)
+        except Exception:
+            logger.exception("Building snapshot %s failed", self.name)
+            raise service_unavailable_error(f"{self.name} is not available yet")
+
+    def invalidate(self) -> None:
+        self._dirty = True
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._rebuild_while_dirty())
+
+    async def _rebuild_while_dirty(self) -> None:
+        # Writes landing during a rebuild set _dirty again and get one more pass.
+        while self._dirty:
+            self._dirty = False
+            await run_job(self.name, self._refresh)
+
+    async def _refresh(self, db: AsyncSession) -> None:
+        self._value = await self._build(db)
+        self._built_at = time.monotonic()
@@ -0,0 +1,170 @@
+"""
+The hot CRUD paths must keep using their indexes. Each check calls the real
+CRUD method against a seeded scratch schema on CHECK_DATABASE_URL, records
+the statements it sends and EXPLAINs them with sequential scans disabled, so
+a changed query that no longer fits its index fails here.
+
+    CHECK_DATABASE_URL=postgresql+asyncpg://.../lms_test python -m pytest tests
+"""
+import asyncio
+import json
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.crud.book import BookCRUD
+from app.crud.book_review import BookReviewCRUD
+from app.crud.borrow import BorrowCRUD
+from app.crud.rate_book import RateBookCRUD
+from app.crud.user import UserCRUD
+from app.models.user import User
+from app.schemas.borrow import BorrowCreate
+from app.utils.scratch_db import check_database_url, scratch_db
+
+try:
+    CHECK_DATABASE_URL = check_database_url()
+except ValueError as exc:
+    pytest.skip(str(exc), allow_module_level=True)
+
+book_crud = BookCRUD()
+
+
+async def _checkout(db):
+    borrow = BorrowCreate(book_id=1, return_date=date.today() + timedelta(days=7))
+    try:
+        await BorrowCRUD.create_borrow(db, borrow, User(user_id="u1"))
+    except HTTPException:
+        pass  # only the statements matter
+
+
+# name: (CRUD call, {table: indexes, any one of which the plans must use})
+PLAN_CHECKS = {
+    "login by user_name": (
+        lambda db: UserCRUD.get_user_by_name(db, "user7"),
+        {"users": {"ix_users_user_name"}},
+    ),
+    "popular books": (
+        lambda db: book_crud.get_popular(db),
+        {"books": {"ix_books_book_rating"}},
+    ),
+    "new books": (
+        lambda db: book_crud.get_new(db),
+        {"books": {"ix_books_created_at"}},
+    ),
+    "featured books": (
+        lambda db: book_crud.get_featured(db),
+        {"books": {"ix_books_featured"}},
+    ),
+    "checkout borrow check": (
+        _checkout,
+        {
+            "borrow_records": {
+                "ix_borrow_records_user_book_status",
+                "uq_borrow_records_active_user_book",
+            }
+        },
+    ),
+    "book page": (
+        lambda db: book_crud.get_bundle(db, 1, "u1"),
+        {
+            "borrow_records": {
+                "ix_borrow_records_user_book_status",
+                "uq_borrow_records_active_user_book",
+            },
+            "book_reviews": {"ix_book_reviews_book_id_created_at"},
+            "user_rating": {"ix_user_rating_book_id_rating"},
+        },
+    ),
+    "borrows by status": (
+        lambda db: BorrowCRUD.list_by_borrow_status(db, "pending"),
+        {"borrow_records": {"ix_borrow_records_borrow_status"}},
+    ),
+    "ledger by due date": (
+        lambda db: BorrowCRUD.get_ledger(db, sort="return_date"),
+        {"borrow_records": {"ix_borrow_records_return_date"}},
+    ),
+    "book reviews": (
+        lambda db: BookReviewCRUD.get_reviews(db, 1),
+        {"book_reviews": {"ix_book_reviews_book_id_created_at"}},
+    ),
+    "rating breakdown": (
+        lambda db: RateBookCRUD.get_rating_breakdown(db, 1),
+        {"user_rating": {"ix_user_rating_book_id_rating"}},
+    ),
+}
+
+
+@contextmanager
+def _recording(engine, statements: list):
+    """Append (statement, parameters) for everything `engine` sends meanwhile."""
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+def _scans(plan: dict, relation: str = None) -> list:
+    """
+    (node type, relation, index) for every scan node in a plan tree. A
+    bitmap index scan reports the relation of the heap scan above it.
+    """
+    relation = plan.get("Relation Name", relation)
+    found = []
+    if "Relation Name" in plan or "Index Name" in plan:
+        found.append((plan["Node Type"], relation, plan.get("Index Name")))
+    for child in plan.get("Plans", []):
+        found += _scans(child, relation)
+    return found
+
+
+async def _collect_scans() -> dict:
+    scans = {}
+    async with scratch_db(CHECK_DATABASE_URL) as scratch:
+        session = sessionmaker(bind=scratch, class_=AsyncSession, expire_on_commit=False)
+        for name, (call, _) in PLAN_CHECKS.items():
+            statements = []
+            with _recording(scratch, statements):
+                async with session() as db:
+                    await call(db)
+            scans[name] = []
+            async with scratch.connect() as conn:
+                # Small seeded tables would otherwise always plan as sequential scans.
+                await conn.exec_driver_sql("SET enable_seqscan = off")
+                for statement, parameters in statements:
+                    result = await conn.exec_driver_sql(
+                        f"EXPLAIN (FORMAT JSON) {statement}", parameters
+                    )
+                    plan = result.scalar()
+                    if isinstance(plan, str):
+                        plan = json.loads(plan)
+                    scans[name] += _scans(plan[0]["Plan"])
+                await conn.rollback()
+    return scans
+
+
+@pytest.fixture(scope="module")
+def scans():
+    return asyncio.run(_collect_scans())
+
+
+@pytest.mark.parametrize("name", PLAN_CHECKS)
+def test_hot_query_uses_index(scans, name):
+    _, expected = PLAN_CHECKS[name]
+    for table, indexes in expected.items():
+        on_table = [scan for scan in scans[name] if scan[1] == table]
+        assert on_table, f"{name}: no statement read {table}"
+        assert not [s for s in on_table if s[0] == "Seq Scan"], (
+            f"{name}: seq scan on {table}: {on_table}"
+        )
+        used = {index for _, _, index in on_table}
+        assert used & indexes, f"{name}: {table} read via {used}, expected one of {indexes}"
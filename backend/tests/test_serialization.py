@@ -0,0 +1,76 @@
+"""
+List responses go through app.utils.serialization.dump_json instead of
+response_model validation plus jsonable_encoder/json.dumps. Both must give
+the same JSON, and the fast path must stay faster. Run with -s to see the
+timings:
+
+    python -m pytest tests/test_serialization.py -s
+"""
+import json
+import time
+from datetime import datetime
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+
+from app.models.book import Book
+from app.schemas.book import BookDetail
+from app.utils.serialization import adapter, dump_json
+
+BOOKS = 1000
+ROUNDS = 20
+
+
+def _sample_books(n: int) -> List[Book]:
+    return [
+        Book(
+            book_id=i,
+            book_title=f"Title {i}",
+            book_category="Science",
+            book_author=f"Author {i % 100}",
+            book_description="A reasonably long description of the book. " * 10,
+            available_copies=i % 5,
+            created_at=datetime(2024, 1, 1),
+            book_availabity=True,
+            featured=i % 10 == 0,
+            book_rating=(i % 50) / 10,
+            book_image=f"https://cdn.example.com/books/{i}.jpg",
+            book_audio=None,
+            book_pdf=None,
+        )
+        for i in range(n)
+    ]
+
+
+def _response_model_path(books: List[Book]) -> bytes:
+    """What a response_model=List[BookDetail] endpoint does per response."""
+    type_adapter = adapter(List[BookDetail])
+    validated = type_adapter.validate_python(books, from_attributes=True)
+    data = jsonable_encoder(type_adapter.dump_python(validated, mode="json"))
+    return json.dumps(data, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+
+def _fast_path(books: List[Book]) -> bytes:
+    return dump_json(List[BookDetail], books)
+
+
+def _ms_per_1000(path, books: List[Book]) -> float:
+    path(books)  # warm up
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        path(books)
+    return (time.perf_counter() - start) / ROUNDS / len(books) * 1000 * 1000
+
+
+def test_fast_path_matches_response_model():
+    books = _sample_books(50)
+    assert json.loads(_fast_path(books)) == json.loads(_response_model_path(books))
+
+
+def test_fast_path_is_faster():
+    books = _sample_books(BOOKS)
+    old = _ms_per_1000(_response_model_path, books)
+    fast = _ms_per_1000(_fast_path, books)
+    print(f"\nresponse_model + json.dumps {old:8.2f} ms per 1,000 books")
+    print(f"TypeAdapter.dump_json       {fast:8.2f} ms per 1,000 books")
+    assert fast < old